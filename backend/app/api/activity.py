@@ -0,0 +1,60 @@
+"""Task activity history endpoints."""
+from fastapi import APIRouter, Query
+from sqlmodel import select
+from app.api.deps import SessionDep, CurrentUserDep, MembershipsDep, ShardSessionsDep
+from app.core.exceptions import validate_task_access
+from app.models.activity import TaskActivity
+from app.schemas.task import ActivityResponse
+
+
+router = APIRouter(prefix="/api/activity", tags=["activity"])
+
+
+@router.get("", response_model=list[ActivityResponse])
+def get_user_activity(
+    session: SessionDep,
+    current_user_id: CurrentUserDep,
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0)
+) -> list[TaskActivity]:
+    """Get the history of the authenticated user's tasks (including editors' changes), newest first."""
+    statement = (
+        select(TaskActivity)
+        .where(TaskActivity.user_id == current_user_id)
+        .order_by(TaskActivity.created_at.desc())
+        .offset(offset)
+        .limit(limit)
+    )
+    return list(session.exec(statement).all())
+
+
+@router.get("/tasks/{task_id}", response_model=list[ActivityResponse])
+def get_task_activity(
+    task_id: str,
+    sessions: ShardSessionsDep,
+    current_user_id: CurrentUserDep,
+    memberships: MembershipsDep,
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0)
+) -> list[TaskActivity]:
+    """Get a task's history, newest first.
+
+    Anyone who can see the task sees its whole history; once the task is
+    deleted, only its owner can.
+    """
+    session, task = sessions.find_task(memberships, task_id)
+    owner_id = current_user_id
+    if task:
+        # CRITICAL: Validate ownership or list membership
+        validate_task_access(task, current_user_id, memberships)
+        owner_id = task.user_id
+
+    statement = (
+        select(TaskActivity)
+        .where(TaskActivity.task_id == task_id)
+        .where(TaskActivity.user_id == owner_id)
+        .order_by(TaskActivity.created_at.desc())
+        .offset(offset)
+        .limit(limit)
+    )
+    return list(session.exec(statement).all())
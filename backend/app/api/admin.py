@@ -0,0 +1,44 @@
+"""Admin endpoints: online backups."""
+from fastapi import APIRouter, Depends, HTTPException, status
+from app.api.deps import require_admin
+from app.schemas.backup import BackupJobResponse
+from app.core.backup import BackupJob, backups
+
+
+router = APIRouter(prefix="/api/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+def _job_response(job: BackupJob) -> BackupJobResponse:
+    return BackupJobResponse(
+        id=job.id,
+        status=job.status,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        error=job.error,
+        files=job.files
+    )
+
+
+@router.post("/backups", response_model=BackupJobResponse, status_code=status.HTTP_202_ACCEPTED)
+def start_backup() -> BackupJobResponse:
+    """Start an online backup of every database; poll its progress by id."""
+    try:
+        job = backups.start()
+    except RuntimeError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
+    return _job_response(job)
+
+
+@router.get("/backups", response_model=list[BackupJobResponse])
+def list_backups() -> list[BackupJobResponse]:
+    """List recent backup runs, newest first."""
+    return [_job_response(job) for job in reversed(list(backups.jobs.values()))]
+
+
+@router.get("/backups/{job_id}", response_model=BackupJobResponse)
+def get_backup(job_id: str) -> BackupJobResponse:
+    """Get a backup run's status and progress."""
+    job = backups.jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Backup not found")
+    return _job_response(job)
@@ -0,0 +1,39 @@
+"""Productivity analytics endpoints."""
+from datetime import date, datetime, timedelta
+from typing import Literal, Optional
+from fastapi import APIRouter, HTTPException, status
+from app.api.deps import SessionDep, CurrentUserDep
+from app.config import settings
+from app.schemas.task import DailyStatsResponse
+from app.core.stats import daily_stats, weekly_stats
+
+
+router = APIRouter(prefix="/api/analytics", tags=["analytics"])
+
+
+@router.get("/tasks", response_model=list[DailyStatsResponse])
+def get_task_stats(
+    session: SessionDep,
+    current_user_id: CurrentUserDep,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    bucket: Literal["day", "week"] = "day"
+) -> list[dict]:
+    """Get tasks created, completed and overdue per day or week (UTC, last 30 days by default)."""
+    # Overdue counts for future days would be guesses, so stop at today
+    today = datetime.utcnow().date()
+    end = min(end or today, today)
+    start = start or end - timedelta(days=29)
+    if start > end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must not be after end"
+        )
+    if (end - start).days >= settings.ANALYTICS_MAX_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.ANALYTICS_MAX_DAYS} days can be requested at once"
+        )
+
+    days = daily_stats(session, current_user_id, start, end)
+    return weekly_stats(days) if bucket == "week" else days
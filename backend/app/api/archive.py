@@ -0,0 +1,69 @@
+"""Archived task API endpoints."""
+from fastapi import APIRouter, HTTPException, Query, status
+from sqlmodel import select
+from app.api.deps import SessionDep, CurrentUserDep
+from app.models.task import ArchivedTask, Task
+from app.schemas.task import ArchivedTaskResponse, TaskResponse
+from app.core.archive import restore_archived_task
+from app.core.exceptions import validate_task_ownership
+from app.core.coalesce import read_coalescer
+
+
+router = APIRouter(prefix="/api/tasks/archived", tags=["archive"])
+
+
+def _get_archived_task(session: SessionDep, task_id: str, current_user_id: str) -> ArchivedTask:
+    """Load an archived task and validate ownership."""
+    task = session.get(ArchivedTask, task_id)
+
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Archived task not found"
+        )
+
+    # CRITICAL: Validate ownership
+    validate_task_ownership(task, current_user_id)
+
+    return task
+
+
+@router.get("", response_model=list[ArchivedTaskResponse])
+def get_archived_tasks(
+    session: SessionDep,
+    current_user_id: CurrentUserDep,
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0)
+) -> list[ArchivedTask]:
+    """Browse archived tasks for the authenticated user, newest first."""
+    statement = (
+        select(ArchivedTask)
+        .where(ArchivedTask.user_id == current_user_id)
+        .order_by(ArchivedTask.archived_at.desc())
+        .offset(offset)
+        .limit(limit)
+    )
+    return list(session.exec(statement).all())
+
+
+@router.get("/{task_id}", response_model=ArchivedTaskResponse)
+def get_archived_task(
+    task_id: str,
+    session: SessionDep,
+    current_user_id: CurrentUserDep
+) -> ArchivedTask:
+    """Get a specific archived task (with ownership validation)."""
+    return _get_archived_task(session, task_id, current_user_id)
+
+
+@router.post("/{task_id}/restore", response_model=TaskResponse)
+def restore_task(
+    task_id: str,
+    session: SessionDep,
+    current_user_id: CurrentUserDep
+) -> Task:
+    """Move an archived task back to the active task list."""
+    archived = _get_archived_task(session, task_id, current_user_id)
+    task = restore_archived_task(session, archived)
+    read_coalescer.invalidate(current_user_id)
+    return task
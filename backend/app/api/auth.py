@@ -1,11 +1,18 @@
 """Authentication endpoints."""
-from typing import Annotated
+from typing import Annotated, Optional
 from fastapi import APIRouter, HTTPException, status, Depends
-from sqlmodel import Session, select
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session
 from app.database import get_session
 from app.models.user import User
-from app.schemas.auth import SignupRequest, LoginRequest, AuthResponse, UserResponse
-from app.core.security import hash_password, verify_password, create_access_token
+from app.schemas.auth import (
+    SignupRequest, LoginRequest, AuthResponse, UserResponse, RefreshRequest, LogoutRequest
+)
+from app.core.sharding import find_user_by_email, create_user
+from app.core.security import (
+    hash_password, verify_password, create_access_token, create_refresh_token,
+    decode_token, revoke_token, verify_token
+)
 
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
@@ -17,8 +24,7 @@ SessionDep = Annotated[Session, Depends(get_session)]
 def signup(signup_data: SignupRequest, session: SessionDep) -> dict:
     """Register a new user."""
     # Check if user already exists
-    statement = select(User).where(User.email == signup_data.email)
-    existing_user = session.exec(statement).first()
+    existing_user = find_user_by_email(session, signup_data.email)
 
     if existing_user:
         raise HTTPException(
@@ -34,18 +40,26 @@ def signup(signup_data: SignupRequest, session: SessionDep) -> dict:
         hashed_password=hashed_pwd
     )
 
-    session.add(new_user)
-    session.commit()
-    session.refresh(new_user)
+    # Stored on the shard for the new user's id
+    try:
+        new_user = create_user(session, new_user)
+    except IntegrityError:
+        session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
 
     # Generate JWT token
     token = create_access_token(new_user.id, new_user.email)
+    refresh_token = create_refresh_token(new_user.id, new_user.email)
 
     # Return response
     return {
         "success": True,
         "data": {
             "token": token,
+            "refresh_token": refresh_token,
             "user": {
                 "id": new_user.id,
                 "email": new_user.email,
@@ -62,8 +76,7 @@ def signup(signup_data: SignupRequest, session: SessionDep) -> dict:
 def login(login_data: LoginRequest, session: SessionDep) -> dict:
     """Authenticate a user and return JWT token."""
     # Find user by email
-    statement = select(User).where(User.email == login_data.email)
-    user = session.exec(statement).first()
+    user = find_user_by_email(session, login_data.email)
 
     if not user:
         raise HTTPException(
@@ -80,12 +93,14 @@ def login(login_data: LoginRequest, session: SessionDep) -> dict:
 
     # Generate JWT token
     token = create_access_token(user.id, user.email)
+    refresh_token = create_refresh_token(user.id, user.email)
 
     # Return response
     return {
         "success": True,
         "data": {
             "token": token,
+            "refresh_token": refresh_token,
             "user": {
                 "id": user.id,
                 "email": user.email,
@@ -98,10 +113,48 @@ def login(login_data: LoginRequest, session: SessionDep) -> dict:
     }
 
 
+@router.post("/refresh", response_model=AuthResponse)
+def refresh(refresh_data: RefreshRequest, session: SessionDep) -> dict:
+    """Exchange a refresh token for a new access/refresh token pair."""
+    payload = decode_token(refresh_data.refresh_token, expected_type="refresh")
+
+    # Rotate: the presented refresh token can only be used once, even by
+    # concurrent requests that both passed the denylist check
+    if not revoke_token(session, payload):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token revoked"
+        )
+
+    return {
+        "success": True,
+        "data": {
+            "token": create_access_token(payload["sub"], payload.get("email", "")),
+            "refresh_token": create_refresh_token(payload["sub"], payload.get("email", ""))
+        },
+        "message": "Token refreshed"
+    }
+
+
 @router.post("/logout")
-def logout() -> dict:
-    """Logout endpoint (stateless - client should discard token)."""
+def logout(
+    session: SessionDep,
+    token_payload: Annotated[dict, Depends(verify_token)],
+    logout_data: Optional[LogoutRequest] = None
+) -> dict:
+    """Logout endpoint - revokes the access token (and refresh token if given)."""
+    revoke_token(session, token_payload)
+
+    if logout_data and logout_data.refresh_token:
+        try:
+            refresh_payload = decode_token(logout_data.refresh_token, expected_type="refresh")
+        except HTTPException:
+            # Already expired, revoked or invalid - nothing left to revoke
+            refresh_payload = None
+        if refresh_payload and refresh_payload.get("sub") == token_payload.get("sub"):
+            revoke_token(session, refresh_payload)
+
     return {
         "success": True,
-        "message": "Logout successful. Please discard your token."
+        "message": "Logout successful"
     }
@@ -1,11 +1,98 @@
 """API dependencies."""
-from typing import Annotated
-from fastapi import Depends
+import secrets
+from typing import Annotated, Iterator, Optional
+from fastapi import Depends, Header, HTTPException, status
+from sqlalchemy.engine import Engine
 from sqlmodel import Session
-from app.database import get_session
+from app.config import settings
+from app.database import engine_for_user
 from app.core.security import get_current_user_id
+from app.core.sharing import Membership, membership_cache
+from app.models.task import Task
+
+
+def get_user_session(
+    current_user_id: Annotated[str, Depends(get_current_user_id)]
+):
+    """Dependency for a session on the authenticated user's shard."""
+    with Session(engine_for_user(current_user_id)) as session:
+        yield session
+
+
+def get_memberships(
+    current_user_id: Annotated[str, Depends(get_current_user_id)]
+) -> dict[str, Membership]:
+    """Dependency for the authenticated user's shared-list memberships."""
+    return membership_cache.get(current_user_id)
+
+
+class ShardSessions:
+    """The user's own session plus sessions on other shards, opened on demand.
+
+    Shared lists keep their tasks on the list owner's shard. Unsharded, every
+    lookup returns the user's own session.
+    """
+
+    def __init__(self, own: Session):
+        self.own = own
+        self._sessions: dict[Engine, Session] = {own.get_bind(): own}
+
+    def for_user(self, user_id: str) -> Session:
+        """Session on the shard holding a user's rows."""
+        db_engine = engine_for_user(user_id)
+        if db_engine not in self._sessions:
+            self._sessions[db_engine] = Session(db_engine)
+        return self._sessions[db_engine]
+
+    def list_ids_by_session(self, memberships: dict[str, Membership]) -> Iterator[tuple[Session, list[str]]]:
+        """Group shared list ids by the session holding their tasks."""
+        grouped: dict[Session, list[str]] = {}
+        for list_id, membership in memberships.items():
+            grouped.setdefault(self.for_user(membership.owner_id), []).append(list_id)
+        return iter(grouped.items())
+
+    def find_task(self, memberships: dict[str, Membership], task_id: str) -> tuple[Session, Optional[Task]]:
+        """Look a task up on the user's shard, then on shards holding their shared lists."""
+        task = self.own.get(Task, task_id)
+        if task:
+            return self.own, task
+        for session, _ in self.list_ids_by_session(memberships):
+            if session is not self.own:
+                task = session.get(Task, task_id)
+                if task:
+                    return session, task
+        return self.own, None
+
+    def close(self) -> None:
+        for session in self._sessions.values():
+            if session is not self.own:
+                session.close()
+
+
+def get_shard_sessions(
+    session: Annotated[Session, Depends(get_user_session)]
+):
+    """Dependency for sessions on any shard, closed with the request."""
+    sessions = ShardSessions(session)
+    try:
+        yield sessions
+    finally:
+        sessions.close()
+
+
+def require_admin(
+    x_admin_token: Annotated[Optional[str], Header()] = None
+) -> None:
+    """Dependency allowing only callers holding ADMIN_API_TOKEN."""
+    if not settings.ADMIN_API_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, settings.ADMIN_API_TOKEN):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin token required")
 
 
 # Type aliases for cleaner route signatures
-SessionDep = Annotated[Session, Depends(get_session)]
+SessionDep = Annotated[Session, Depends(get_user_session)]
 CurrentUserDep = Annotated[str, Depends(get_current_user_id)]
+MembershipsDep = Annotated[dict[str, Membership], Depends(get_memberships)]
+ShardSessionsDep = Annotated[ShardSessions, Depends(get_shard_sessions)]
+IdempotencyKeyDep = Annotated[Optional[str], Header(alias="Idempotency-Key", min_length=1, max_length=255)]
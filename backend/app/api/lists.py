@@ -0,0 +1,211 @@
+"""Shared task list endpoints."""
+from typing import Annotated
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import delete, func, update
+from sqlmodel import Session, select
+from datetime import datetime
+from app.api.deps import CurrentUserDep
+from app.config import settings
+from app.database import engine_for_user, get_session
+from app.models.task import Task, ArchivedTask
+from app.models.task_list import ListMember, TaskList
+from app.schemas.task_list import (
+    ListCreate, ListUpdate, MemberUpsert, ListResponse, ListDetailResponse
+)
+from app.core.coalesce import read_coalescer
+from app.core.sharding import find_user_by_email
+from app.core.sharing import membership_cache
+
+
+router = APIRouter(prefix="/api/lists", tags=["lists"])
+
+# Lists and memberships live on the primary database
+PrimarySessionDep = Annotated[Session, Depends(get_session)]
+
+
+def _list_response(task_list: TaskList, role: str) -> dict:
+    return {**task_list.model_dump(), "role": role}
+
+
+def _get_member_list(
+    session: Session,
+    list_id: str,
+    current_user_id: str,
+    owner: bool = False
+) -> tuple[TaskList, ListMember]:
+    """Load a list the user belongs to (or, with owner, owns); checked against the database."""
+    task_list = session.get(TaskList, list_id)
+    member = session.get(ListMember, (list_id, current_user_id))
+
+    if not task_list or not member:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="List not found"
+        )
+    if owner and member.role != "owner":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only the list owner can do this"
+        )
+    return task_list, member
+
+
+def _memberships_changed(*user_ids: str) -> None:
+    """Drop cached permissions and in-flight reads of the affected users."""
+    membership_cache.invalidate(user_ids)
+    for user_id in user_ids:
+        read_coalescer.invalidate(user_id)
+
+
+@router.get("", response_model=list[ListResponse])
+def get_lists(
+    session: PrimarySessionDep,
+    current_user_id: CurrentUserDep
+) -> list[dict]:
+    """Get the lists the authenticated user owns or is a member of."""
+    rows = session.exec(
+        select(TaskList, ListMember.role)
+        .join(ListMember, ListMember.list_id == TaskList.id)
+        .where(ListMember.user_id == current_user_id)
+        .order_by(TaskList.name)
+    ).all()
+    return [_list_response(task_list, role) for task_list, role in rows]
+
+
+@router.post("", response_model=ListResponse, status_code=status.HTTP_201_CREATED)
+def create_list(
+    list_data: ListCreate,
+    session: PrimarySessionDep,
+    current_user_id: CurrentUserDep
+) -> dict:
+    """Create a list owned by the authenticated user."""
+    task_list = TaskList(name=list_data.name, owner_id=current_user_id)
+    session.add(task_list)
+    session.add(ListMember(list_id=task_list.id, user_id=current_user_id, role="owner"))
+    session.commit()
+    session.refresh(task_list)
+    _memberships_changed(current_user_id)
+    return _list_response(task_list, "owner")
+
+
+@router.get("/{list_id}", response_model=ListDetailResponse)
+def get_list(
+    list_id: str,
+    session: PrimarySessionDep,
+    current_user_id: CurrentUserDep
+) -> dict:
+    """Get a list with its members (members only)."""
+    task_list, member = _get_member_list(session, list_id, current_user_id)
+    members = session.exec(
+        select(ListMember).where(ListMember.list_id == list_id).order_by(ListMember.created_at)
+    ).all()
+    return {**_list_response(task_list, member.role), "members": members}
+
+
+@router.patch("/{list_id}", response_model=ListResponse)
+def rename_list(
+    list_id: str,
+    list_data: ListUpdate,
+    session: PrimarySessionDep,
+    current_user_id: CurrentUserDep
+) -> dict:
+    """Rename a list (owner only)."""
+    task_list, member = _get_member_list(session, list_id, current_user_id, owner=True)
+    task_list.name = list_data.name
+    task_list.updated_at = datetime.utcnow()
+    session.add(task_list)
+    session.commit()
+    session.refresh(task_list)
+    return _list_response(task_list, member.role)
+
+
+@router.delete("/{list_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_list(
+    list_id: str,
+    session: PrimarySessionDep,
+    current_user_id: CurrentUserDep
+) -> None:
+    """Delete a list (owner only); its tasks stay with the owner, outside any list."""
+    task_list, _ = _get_member_list(session, list_id, current_user_id, owner=True)
+
+    # Detach the tasks first so they are never left pointing at a missing list
+    with Session(engine_for_user(task_list.owner_id)) as shard_session:
+        for model in (Task, ArchivedTask):
+            shard_session.execute(
+                update(model)
+                .where(model.user_id == task_list.owner_id)
+                .where(model.list_id == list_id)
+                .values(list_id=None)
+                .execution_options(synchronize_session=False)
+            )
+        shard_session.commit()
+
+    member_ids = session.exec(select(ListMember.user_id).where(ListMember.list_id == list_id)).all()
+    session.execute(delete(ListMember).where(ListMember.list_id == list_id))
+    session.delete(task_list)
+    session.commit()
+    _memberships_changed(*member_ids)
+
+
+@router.put("/{list_id}/members", response_model=ListDetailResponse)
+def share_list(
+    list_id: str,
+    member_data: MemberUpsert,
+    session: PrimarySessionDep,
+    current_user_id: CurrentUserDep
+) -> dict:
+    """Share a list with a user by email, or change their role (owner only)."""
+    task_list, owner = _get_member_list(session, list_id, current_user_id, owner=True)
+
+    user = find_user_by_email(session, member_data.email)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    if user.id == current_user_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="The owner's role can't be changed"
+        )
+
+    member = session.get(ListMember, (list_id, user.id))
+    if member is None:
+        count = session.exec(select(func.count()).where(ListMember.list_id == list_id)).one()
+        if count >= settings.MAX_LIST_MEMBERS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"A list can have at most {settings.MAX_LIST_MEMBERS} members"
+            )
+        member = ListMember(list_id=list_id, user_id=user.id)
+    member.role = member_data.role
+    session.add(member)
+    session.commit()
+    _memberships_changed(user.id)
+    return get_list(list_id, session, current_user_id)
+
+
+@router.delete("/{list_id}/members/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
+def remove_member(
+    list_id: str,
+    user_id: str,
+    session: PrimarySessionDep,
+    current_user_id: CurrentUserDep
+) -> None:
+    """Remove a member (owner), or leave a list (any member)."""
+    _, caller = _get_member_list(session, list_id, current_user_id, owner=user_id != current_user_id)
+    if user_id == current_user_id and caller.role == "owner":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="The owner can't leave a list; delete it instead"
+        )
+
+    member = session.get(ListMember, (list_id, user_id))
+    if not member:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Member not found"
+        )
+    session.delete(member)
+    session.commit()
+    _memberships_changed(user_id)
@@ -0,0 +1,130 @@
+"""Recurring task series API endpoints."""
+from fastapi import APIRouter, HTTPException, status
+from sqlalchemy import update
+from sqlmodel import select
+from datetime import datetime
+from typing import Optional
+from app.api.deps import SessionDep, CurrentUserDep
+from app.models.series import TaskSeries
+from app.models.task import Task, ArchivedTask
+from app.schemas.series import SeriesCreate, SeriesUpdate, SeriesResponse
+from app.core.exceptions import validate_task_ownership
+from app.core.recurrence import normalize_datetime
+from app.core.coalesce import read_coalescer
+
+
+router = APIRouter(prefix="/api/series", tags=["series"])
+
+
+def _get_owned_series(session: SessionDep, series_id: str, current_user_id: str) -> TaskSeries:
+    """Load a series and validate ownership."""
+    series = session.get(TaskSeries, series_id)
+
+    if not series:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Series not found"
+        )
+
+    # CRITICAL: Validate ownership
+    validate_task_ownership(series, current_user_id)
+
+    return series
+
+
+def _check_bounds(starts_at: datetime, until: Optional[datetime]) -> None:
+    """Reject a series that would end before it starts."""
+    if until is not None and until < starts_at:
+        raise HTTPException(
+            status_code=422,
+            detail="until must not be before starts_at"
+        )
+
+
+@router.get("", response_model=list[SeriesResponse])
+def get_series_list(
+    session: SessionDep,
+    current_user_id: CurrentUserDep
+) -> list[TaskSeries]:
+    """Get all recurring series for the authenticated user."""
+    statement = select(TaskSeries).where(TaskSeries.user_id == current_user_id)
+    return list(session.exec(statement).all())
+
+
+@router.post("", response_model=SeriesResponse, status_code=status.HTTP_201_CREATED)
+def create_series(
+    series_data: SeriesCreate,
+    session: SessionDep,
+    current_user_id: CurrentUserDep
+) -> TaskSeries:
+    """Create a recurring series; occurrences are generated when listed."""
+    data = series_data.model_dump()
+    data["starts_at"] = normalize_datetime(data["starts_at"])
+    data["until"] = normalize_datetime(data["until"])
+    _check_bounds(data["starts_at"], data["until"])
+    series = TaskSeries(**data, user_id=current_user_id)
+    session.add(series)
+    session.commit()
+    session.refresh(series)
+    read_coalescer.invalidate(current_user_id)
+    return series
+
+
+@router.get("/{series_id}", response_model=SeriesResponse)
+def get_series(
+    series_id: str,
+    session: SessionDep,
+    current_user_id: CurrentUserDep
+) -> TaskSeries:
+    """Get a specific series (with ownership validation)."""
+    return _get_owned_series(session, series_id, current_user_id)
+
+
+@router.put("/{series_id}", response_model=SeriesResponse)
+def update_series(
+    series_id: str,
+    series_data: SeriesUpdate,
+    session: SessionDep,
+    current_user_id: CurrentUserDep
+) -> TaskSeries:
+    """Update a series; occurrences already materialized keep their own values."""
+    series = _get_owned_series(session, series_id, current_user_id)
+
+    update_data = series_data.model_dump(exclude_unset=True)
+    for key in ("starts_at", "until"):
+        if key in update_data:
+            update_data[key] = normalize_datetime(update_data[key])
+    _check_bounds(
+        update_data.get("starts_at", series.starts_at),
+        update_data.get("until", series.until)
+    )
+    for key, value in update_data.items():
+        setattr(series, key, value)
+
+    series.updated_at = datetime.utcnow()
+    session.add(series)
+    session.commit()
+    session.refresh(series)
+    read_coalescer.invalidate(current_user_id)
+    return series
+
+
+@router.delete("/{series_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_series(
+    series_id: str,
+    session: SessionDep,
+    current_user_id: CurrentUserDep
+) -> None:
+    """Delete a series; its materialized occurrences stay as ordinary tasks."""
+    series = _get_owned_series(session, series_id, current_user_id)
+
+    for model in (Task, ArchivedTask):
+        session.execute(
+            update(model)
+            .where(model.series_id == series.id)
+            .values(series_id=None)
+            .execution_options(synchronize_session=False)
+        )
+    session.delete(series)
+    session.commit()
+    read_coalescer.invalidate(current_user_id)
@@ -1,139 +1,537 @@
 """Task API endpoints."""
-from fastapi import APIRouter, HTTPException, status
-from sqlmodel import select
+from typing import Any, Callable, Optional
+from fastapi import APIRouter, HTTPException, Query, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy import and_, or_, update
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, select
 from datetime import datetime
-from app.api.deps import SessionDep, CurrentUserDep
+from app.api.deps import (
+    SessionDep, CurrentUserDep, MembershipsDep, ShardSessions, ShardSessionsDep, IdempotencyKeyDep
+)
 from app.models.task import Task
-from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse
-from app.core.exceptions import validate_task_ownership
+from app.schemas.task import (
+    TaskCreate, TaskUpdate, TaskResponse, TaskMove, TagCount, normalize_tags
+)
+from app.core.exceptions import validate_task_access
+from app.core.sharing import Membership, WRITE_ROLES
+from app.core.tags import set_task_tags, tasks_with_all_tags, tag_counts
+from app.core.subtasks import (
+    attach_to_parent, completion_changed, delete_subtree, ensure_path, move_subtree,
+    subtree_condition, subtree_statement
+)
+from app.core.recurrence import (
+    find_occurrence_series, materialize_occurrence, normalize_datetime, skip_occurrence,
+    virtual_occurrences, virtual_task
+)
+from app.core.activity import activity_log, diff_snapshots, task_snapshot
+from app.core.coalesce import read_coalescer
+from app.core.idempotency import StoredResponse, idempotency_store, request_fingerprint
+from app.core.stats import record_deletion, record_stats, stats_state
+from app.models.series import TaskSeries
 
 
 router = APIRouter(prefix="/api/tasks", tags=["tasks"])
 
+_task_adapter = TypeAdapter(TaskResponse)
+_task_list_adapter = TypeAdapter(list[TaskResponse])
+_tag_counts_adapter = TypeAdapter(list[TagCount])
+
+
+def _coalesced(
+    current_user_id: str,
+    key: tuple,
+    adapter: TypeAdapter,
+    compute: Callable[[], Any]
+) -> Response:
+    """Serve a read as JSON, sharing the query and serialization with identical concurrent reads."""
+    body = read_coalescer.run(
+        current_user_id,
+        key,
+        lambda: adapter.dump_json(adapter.validate_python(compute(), from_attributes=True))
+    )
+    return Response(content=body, media_type="application/json")
+
+
+def _idempotent(
+    current_user_id: str,
+    idempotency_key: Optional[str],
+    fingerprint: tuple,
+    status_code: int,
+    adapter: Optional[TypeAdapter],
+    write: Callable[[], Any]
+) -> Response:
+    """Run a write once per Idempotency-Key; retries get the first response replayed."""
+    def run() -> StoredResponse:
+        result = write()
+        body = adapter.dump_json(adapter.validate_python(result, from_attributes=True)) if adapter else b""
+        return StoredResponse(status_code, body)
+
+    if idempotency_key is None:
+        stored, replayed = run(), False
+    else:
+        stored, replayed = idempotency_store.run(
+            current_user_id, idempotency_key, request_fingerprint(*fingerprint), run
+        )
+    headers = {"Idempotent-Replayed": "true"} if replayed else None
+    if adapter is None:
+        return Response(status_code=stored.status_code, headers=headers)
+    return Response(
+        content=stored.body,
+        status_code=stored.status_code,
+        media_type="application/json",
+        headers=headers
+    )
+
+
+def _invalidate_reads(current_user_id: str, *list_ids: Optional[str]) -> None:
+    """Detach in-flight reads a write affects (everyone's, if it touched a list).
+
+    The list case is deliberately broad: every member of a shared list sees
+    its tasks in their own reads, and the coalescer keys reads by user, not
+    list. Narrowing this to the writer (or owner) would let members keep
+    getting results from before the write. Membership changes invalidate the
+    affected users separately (``lists._memberships_changed``).
+    """
+    if any(list_ids):
+        read_coalescer.invalidate()
+    else:
+        read_coalescer.invalidate(current_user_id)
+
+
+def _get_task(
+    sessions: ShardSessions,
+    memberships: dict[str, Membership],
+    task_id: str,
+    current_user_id: str,
+    write: bool = False,
+    materialize: bool = False
+) -> tuple[Session, Task]:
+    """Load a task with the session holding it and validate access.
+
+    With ``materialize``, a recurring occurrence addressed by its synthetic id
+    is turned into a real task first.
+    """
+    session, task = sessions.find_task(memberships, task_id)
+
+    if not task and materialize:
+        occurrence = find_occurrence_series(sessions.own, current_user_id, task_id)
+        if occurrence:
+            session, task = sessions.own, materialize_occurrence(sessions.own, *occurrence)
+
+    if not task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found"
+        )
+
+    # CRITICAL: Validate ownership or list membership
+    validate_task_access(task, current_user_id, memberships, write)
+
+    return session, task
+
+
+def _get_list_membership(
+    memberships: dict[str, Membership],
+    list_id: str,
+    write: bool = False
+) -> Membership:
+    """The user's membership of a list, 404 if they aren't a member."""
+    membership = memberships.get(list_id)
+    if membership is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="List not found"
+        )
+    if write and membership.role not in WRITE_ROLES:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You have read-only access to this list"
+        )
+    return membership
+
+
+def _change_list(
+    session: Session,
+    task: Task,
+    list_id: Optional[str],
+    current_user_id: str,
+    memberships: dict[str, Membership]
+) -> None:
+    """Move a top-level task and its subtasks into another list of the same owner."""
+    if task.user_id != current_user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only the task's owner can move it between lists"
+        )
+    if task.parent_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Subtasks stay in their parent's list"
+        )
+    if list_id is not None and _get_list_membership(memberships, list_id).owner_id != current_user_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Tasks can only be moved into your own lists"
+        )
+    ensure_path(task)
+    session.execute(
+        update(Task)
+        .where(subtree_condition(task))
+        .values(list_id=list_id)
+        .execution_options(synchronize_session=False)
+    )
+    task.list_id = list_id
+
 
 @router.get("", response_model=list[TaskResponse])
 def get_tasks(
+    sessions: ShardSessionsDep,
+    current_user_id: CurrentUserDep,
+    memberships: MembershipsDep,
+    tag: Optional[list[str]] = Query(None),
+    due_from: Optional[datetime] = None,
+    due_to: Optional[datetime] = None,
+    list_id: Optional[str] = None
+) -> Response:
+    """Get the authenticated user's tasks plus tasks of lists shared with them.
+
+    Optionally only one list's tasks, those with every given tag, or those due
+    in [due_from, due_to); a full due window also includes recurring
+    occurrences in that window.
+    """
+    tags = normalize_tags(tag)
+    due_from, due_to = normalize_datetime(due_from), normalize_datetime(due_to)
+
+    def scopes() -> list[tuple[Session, Any, list[str]]]:
+        """(session, visibility condition, owner ids) per shard involved."""
+        if list_id is not None:
+            owner_id = _get_list_membership(memberships, list_id).owner_id
+            condition = and_(Task.list_id == list_id, Task.user_id == owner_id)
+            return [(sessions.for_user(owner_id), condition, [owner_id])]
+
+        shared = {key: value for key, value in memberships.items() if value.owner_id != current_user_id}
+        result = []
+        own_found = False
+        for session, list_ids in sessions.list_ids_by_session(shared):
+            owner_ids = sorted({shared[key].owner_id for key in list_ids})
+            condition = and_(Task.list_id.in_(list_ids), Task.user_id.in_(owner_ids))
+            if session is sessions.own:
+                condition = or_(Task.user_id == current_user_id, condition)
+                owner_ids = [current_user_id, *owner_ids]
+                own_found = True
+            result.append((session, condition, owner_ids))
+        if not own_found:
+            result.insert(0, (sessions.own, Task.user_id == current_user_id, [current_user_id]))
+        return result
+
+    def load() -> list:
+        tasks = []
+        # One query per shard involved: own and shared tasks together
+        for session, condition, owner_ids in scopes():
+            # Tags for all returned tasks come from one batched IN query
+            statement = select(Task).where(condition).options(selectinload(Task.tags))
+            if tags:
+                statement = statement.where(Task.id.in_(tasks_with_all_tags(owner_ids, tags)))
+            if due_from is not None:
+                statement = statement.where(Task.due_date >= due_from)
+            if due_to is not None:
+                statement = statement.where(Task.due_date < due_to)
+            tasks.extend(session.exec(statement).all())
+
+        if due_from is None or due_to is None or list_id is not None:
+            return tasks
+
+        # Recurring occurrences are generated for the requested window only
+        occurrences = virtual_occurrences(sessions.own, current_user_id, due_from, due_to)
+        if tags:
+            occurrences = [item for item in occurrences if set(tags) <= set(item["tags"])]
+        items = tasks + occurrences
+        items.sort(key=lambda item: item["due_date"] if isinstance(item, dict) else item.due_date)
+        return items
+
+    return _coalesced(
+        current_user_id,
+        ("list", tuple(tags or ()), due_from, due_to, list_id),
+        _task_list_adapter,
+        load
+    )
+
+
+@router.get("/tags", response_model=list[TagCount])
+def get_tag_counts(
     session: SessionDep,
     current_user_id: CurrentUserDep
-) -> list[Task]:
-    """Get all tasks for the authenticated user."""
-    statement = select(Task).where(Task.user_id == current_user_id)
-    tasks = session.exec(statement).all()
-    return list(tasks)
+) -> Response:
+    """Get each tag used by the authenticated user with its task count."""
+    return _coalesced(
+        current_user_id,
+        ("tags",),
+        _tag_counts_adapter,
+        lambda: [{"tag": tag, "count": count} for tag, count in tag_counts(session, current_user_id)]
+    )
 
 
 @router.post("", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
 def create_task(
     task_data: TaskCreate,
-    session: SessionDep,
-    current_user_id: CurrentUserDep
-) -> Task:
-    """Create a new task for the authenticated user."""
-    task = Task(
-        **task_data.model_dump(),
-        user_id=current_user_id
+    sessions: ShardSessionsDep,
+    current_user_id: CurrentUserDep,
+    memberships: MembershipsDep,
+    idempotency_key: IdempotencyKeyDep = None
+) -> Response:
+    """Create a new task for the authenticated user, or in a list they can edit.
+
+    Tasks in a list belong to the list's owner and live on the owner's shard.
+    """
+    def write() -> Task:
+        session, parent = sessions.own, None
+        owner_id, list_id = current_user_id, task_data.list_id
+        if task_data.parent_id:
+            session, parent = _get_task(sessions, memberships, task_data.parent_id, current_user_id, write=True)
+            if list_id is not None and list_id != parent.list_id:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Subtasks belong to their parent's list"
+                )
+            owner_id, list_id = parent.user_id, parent.list_id
+        elif list_id is not None:
+            owner_id = _get_list_membership(memberships, list_id, write=True).owner_id
+            session = sessions.for_user(owner_id)
+
+        task = Task(
+            **task_data.model_dump(exclude={"tags", "parent_id", "list_id"}),
+            user_id=owner_id,
+            list_id=list_id
+        )
+        attach_to_parent(session, task, parent)
+        set_task_tags(task, task_data.tags)
+        record_stats(session, owner_id, after=[stats_state(task)])
+        session.add(task)
+        session.commit()
+        session.refresh(task)
+        _invalidate_reads(current_user_id, task.list_id)
+        activity_log.record(
+            task.user_id, task.id, "create", diff_snapshots({}, task_snapshot(task)), current_user_id
+        )
+        return task
+
+    return _idempotent(
+        current_user_id, idempotency_key, ("create", task_data.model_dump_json()),
+        status.HTTP_201_CREATED, _task_adapter, write
     )
-    session.add(task)
-    session.commit()
-    session.refresh(task)
-    return task
 
 
 @router.get("/{task_id}", response_model=TaskResponse)
 def get_task(
     task_id: str,
-    session: SessionDep,
-    current_user_id: CurrentUserDep
-) -> Task:
-    """Get a specific task (with ownership validation)."""
-    task = session.get(Task, task_id)
+    sessions: ShardSessionsDep,
+    current_user_id: CurrentUserDep,
+    memberships: MembershipsDep
+) -> Response:
+    """Get a specific task (with ownership or list membership validation)."""
+    def load() -> Task | dict:
+        _, task = sessions.find_task(memberships, task_id)
 
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found"
-        )
+        if not task:
+            occurrence = find_occurrence_series(sessions.own, current_user_id, task_id)
+            if occurrence:
+                return virtual_task(*occurrence)
 
-    # CRITICAL: Validate ownership
-    validate_task_ownership(task, current_user_id)
+        if not task:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Task not found"
+            )
 
-    return task
+        # CRITICAL: Validate ownership or list membership
+        validate_task_access(task, current_user_id, memberships)
+
+        return task
+
+    return _coalesced(current_user_id, ("task", task_id), _task_adapter, load)
 
 
 @router.put("/{task_id}", response_model=TaskResponse)
 def update_task(
     task_id: str,
     task_data: TaskUpdate,
-    session: SessionDep,
-    current_user_id: CurrentUserDep
-) -> Task:
-    """Update a task (with ownership validation)."""
-    task = session.get(Task, task_id)
+    sessions: ShardSessionsDep,
+    current_user_id: CurrentUserDep,
+    memberships: MembershipsDep,
+    idempotency_key: IdempotencyKeyDep = None
+) -> Response:
+    """Update a task (with ownership or editor validation)."""
+    def write() -> Task:
+        # Editing a recurring occurrence materializes it
+        session, task = _get_task(sessions, memberships, task_id, current_user_id, write=True, materialize=True)
 
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found"
-        )
+        before = task_snapshot(task)
+        stats_before = stats_state(task)
+        list_before = task.list_id
 
-    # CRITICAL: Validate ownership
-    validate_task_ownership(task, current_user_id)
+        # Update only provided fields
+        update_data = task_data.model_dump(exclude_unset=True)
+        tags = update_data.pop("tags", None)
+        if "list_id" in update_data:
+            list_id = update_data.pop("list_id")
+            if list_id != task.list_id:
+                _change_list(session, task, list_id, current_user_id, memberships)
+        was_completed = task.completed
+        for key, value in update_data.items():
+            setattr(task, key, value)
+        if tags is not None:
+            set_task_tags(task, tags)
+        if task.completed != was_completed:
+            task.completed_at = datetime.utcnow() if task.completed else None
+            completion_changed(session, task)
+        record_stats(session, task.user_id, before=[stats_before], after=[stats_state(task)])
 
-    # Update only provided fields
-    update_data = task_data.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(task, key, value)
+        task.updated_at = datetime.utcnow()
+        session.add(task)
+        session.commit()
+        session.refresh(task)
+        _invalidate_reads(current_user_id, list_before, task.list_id)
+        activity_log.record(
+            task.user_id, task.id, "update", diff_snapshots(before, task_snapshot(task)), current_user_id
+        )
+        return task
 
-    task.updated_at = datetime.utcnow()
-    session.add(task)
-    session.commit()
-    session.refresh(task)
-    return task
+    return _idempotent(
+        current_user_id, idempotency_key, ("update", task_id, task_data.model_dump_json(exclude_unset=True)),
+        status.HTTP_200_OK, _task_adapter, write
+    )
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_task(
     task_id: str,
-    session: SessionDep,
-    current_user_id: CurrentUserDep
-) -> None:
-    """Delete a task (with ownership validation)."""
-    task = session.get(Task, task_id)
+    sessions: ShardSessionsDep,
+    current_user_id: CurrentUserDep,
+    memberships: MembershipsDep,
+    idempotency_key: IdempotencyKeyDep = None
+) -> Response:
+    """Delete a task (with ownership or editor validation)."""
+    def write() -> None:
+        session, task = sessions.find_task(memberships, task_id)
 
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found"
-        )
+        if not task:
+            # Deleting an unmaterialized recurring occurrence just skips it
+            occurrence = find_occurrence_series(session, current_user_id, task_id)
+            if occurrence:
+                skip_occurrence(*occurrence)
+                session.add(occurrence[0])
+                session.commit()
+                read_coalescer.invalidate(current_user_id)
+                return
 
-    # CRITICAL: Validate ownership
-    validate_task_ownership(task, current_user_id)
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Task not found"
+            )
 
-    session.delete(task)
-    session.commit()
+        # CRITICAL: Validate ownership or list membership
+        validate_task_access(task, current_user_id, memberships, write=True)
+
+        # Keep a deleted occurrence from being generated again
+        if task.series_id and task.occurrence_at:
+            series = session.get(TaskSeries, task.series_id)
+            if series:
+                skip_occurrence(series, task.occurrence_at)
+                session.add(series)
+
+        before = task_snapshot(task)
+        owner_id, list_id = task.user_id, task.list_id
+
+        # Subtasks go with their parent in one statement
+        ensure_path(task)
+        record_deletion(session, task.user_id, subtree_condition(task))
+        delete_subtree(session, task)
+        session.commit()
+        _invalidate_reads(current_user_id, list_id)
+        activity_log.record(owner_id, task_id, "delete", diff_snapshots(before, {}), current_user_id)
+
+    return _idempotent(
+        current_user_id, idempotency_key, ("delete", task_id),
+        status.HTTP_204_NO_CONTENT, None, write
+    )
 
 
 @router.patch("/{task_id}/complete", response_model=TaskResponse)
 def toggle_complete(
     task_id: str,
-    session: SessionDep,
-    current_user_id: CurrentUserDep
-) -> Task:
-    """Toggle task completion status (with ownership validation)."""
-    task = session.get(Task, task_id)
+    sessions: ShardSessionsDep,
+    current_user_id: CurrentUserDep,
+    memberships: MembershipsDep,
+    idempotency_key: IdempotencyKeyDep = None
+) -> Response:
+    """Toggle task completion status (with ownership or editor validation)."""
+    def write() -> Task:
+        # Editing a recurring occurrence materializes it
+        session, task = _get_task(sessions, memberships, task_id, current_user_id, write=True, materialize=True)
 
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found"
+        stats_before = stats_state(task)
+        task.completed = not task.completed
+        task.updated_at = datetime.utcnow()
+        task.completed_at = task.updated_at if task.completed else None
+        completion_changed(session, task)
+        record_stats(session, task.user_id, before=[stats_before], after=[stats_state(task)])
+        session.add(task)
+        session.commit()
+        session.refresh(task)
+        _invalidate_reads(current_user_id, task.list_id)
+        activity_log.record(
+            task.user_id, task.id,
+            "complete" if task.completed else "reopen",
+            {"completed": [not task.completed, task.completed]},
+            current_user_id
         )
+        return task
+
+    return _idempotent(
+        current_user_id, idempotency_key, ("complete", task_id),
+        status.HTTP_200_OK, _task_adapter, write
+    )
 
-    # CRITICAL: Validate ownership
-    validate_task_ownership(task, current_user_id)
 
-    task.completed = not task.completed
+@router.get("/{task_id}/subtree", response_model=list[TaskResponse])
+def get_subtree(
+    task_id: str,
+    sessions: ShardSessionsDep,
+    current_user_id: CurrentUserDep,
+    memberships: MembershipsDep
+) -> Response:
+    """Get a task and all nested subtasks, depth-first (one recursive query)."""
+    def load() -> list[Task]:
+        session, task = _get_task(sessions, memberships, task_id, current_user_id)
+        return list(session.exec(subtree_statement(task.user_id, task_id)).all())
+
+    return _coalesced(current_user_id, ("subtree", task_id), _task_list_adapter, load)
+
+
+@router.patch("/{task_id}/move", response_model=TaskResponse)
+def move_task(
+    task_id: str,
+    move_data: TaskMove,
+    sessions: ShardSessionsDep,
+    current_user_id: CurrentUserDep,
+    memberships: MembershipsDep
+) -> Task:
+    """Move a task with its subtasks under another task of its list, or to the top level."""
+    session, task = _get_task(sessions, memberships, task_id, current_user_id, write=True)
+    parent = None
+    if move_data.parent_id:
+        _, parent = _get_task(sessions, memberships, move_data.parent_id, current_user_id, write=True)
+        if parent.user_id != task.user_id or parent.list_id != task.list_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Subtasks must be in the same list as their parent"
+            )
+
+    move_subtree(session, task, parent)
     task.updated_at = datetime.utcnow()
     session.add(task)
     session.commit()
     session.refresh(task)
+    _invalidate_reads(current_user_id, task.list_id)
     return task
@@ -1,4 +1,5 @@
 """Configuration settings for the Todo App backend."""
+from typing import Optional
 from pydantic_settings import BaseSettings
 
 
@@ -11,9 +12,108 @@ class Settings(BaseSettings):
     
     # Database Configuration
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = False
+    DB_POOL_WARMUP_CONNECTIONS: int = 5
+    DB_POOL_LIVENESS_INTERVAL_SECONDS: int = 30
+    DB_POOL_READY_MAX_SATURATION: float = 0.9
+
+    # Shard map: users are spread over these databases by a stable hash of
+    # their id (see app.database.shard_for_user). Empty means unsharded and
+    # DATABASE_URL holds everything; otherwise DATABASE_URL keeps the email
+    # directory and revoked tokens. Set as JSON, e.g.
+    # SHARD_DATABASE_URLS='["sqlite:///./shard0.db", "sqlite:///./shard1.db"]'
+    SHARD_DATABASE_URLS: list[str] = []
     
     # Application Configuration
     DEBUG: bool = False
+
+    # Token Configuration
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    DENYLIST_BLOOM_CAPACITY: int = 100_000
+    DENYLIST_BLOOM_ERROR_RATE: float = 0.001
+    DENYLIST_SYNC_SECONDS: int = 5
+    DENYLIST_REBUILD_SECONDS: int = 3600
+
+    # Task Configuration
+    TASK_MAX_DEPTH: int = 50
+    RECURRENCE_MAX_OCCURRENCES: int = 1000
+
+    # Activity Log Configuration
+    # "async": queued and written in batches by a background thread; entries
+    #   still queued when the process is killed (not shut down) are lost, and
+    #   entries arriving while the queue is full are dropped and counted
+    # "sync": written in the request right after the change commits
+    # "off": not recorded
+    ACTIVITY_LOG_MODE: str = "async"
+    ACTIVITY_QUEUE_SIZE: int = 10_000
+    ACTIVITY_BATCH_SIZE: int = 500
+    ACTIVITY_FLUSH_INTERVAL_SECONDS: float = 1.0
+
+    # Access Log Configuration
+    # JSON lines to ACCESS_LOG_FILE (stdout if unset); successful fast requests
+    # are sampled, errors and requests over ACCESS_LOG_SLOW_MS always logged
+    ACCESS_LOG_ENABLED: bool = True
+    ACCESS_LOG_FILE: Optional[str] = None
+    ACCESS_LOG_SAMPLE_RATE: float = 0.1
+    ACCESS_LOG_SLOW_MS: float = 500.0
+    ACCESS_LOG_QUEUE_SIZE: int = 10_000
+    ACCESS_LOG_BATCH_SIZE: int = 200
+    ACCESS_LOG_FLUSH_INTERVAL_SECONDS: float = 0.5
+
+    # Shared Lists Configuration
+    # Membership changes reach other workers' caches within
+    # MEMBERSHIP_SYNC_SECONDS; the TTL is only a backstop
+    MEMBERSHIP_CACHE_TTL_SECONDS: float = 30.0
+    MEMBERSHIP_SYNC_SECONDS: float = 1.0
+    MEMBERSHIP_CACHE_SIZE: int = 10_000
+    MAX_LIST_MEMBERS: int = 100
+
+    # Read Coalescing Configuration
+    # Identical concurrent task reads by one user share a single query
+    READ_COALESCING_ENABLED: bool = True
+
+    # Archiving Configuration
+    ARCHIVE_ENABLED: bool = True
+    ARCHIVE_AFTER_DAYS: int = 30
+    ARCHIVE_BATCH_SIZE: int = 500
+    ARCHIVE_INTERVAL_SECONDS: int = 3600
+
+    # Analytics Configuration
+    ANALYTICS_MAX_DAYS: int = 731
+    STATS_COMPACTION_INTERVAL_SECONDS: int = 3600
+    STATS_COMPACTION_BATCH_SIZE: int = 1000
+
+    # Idempotency Configuration
+    # Responses to writes sent with an Idempotency-Key are kept this long;
+    # a retry waits up to IDEMPOTENCY_WAIT_SECONDS for a first request still
+    # running, and a claim left by a crashed worker frees up after
+    # IDEMPOTENCY_LOCK_SECONDS
+    IDEMPOTENCY_TTL_SECONDS: int = 86_400
+    IDEMPOTENCY_CACHE_SIZE: int = 10_000
+    IDEMPOTENCY_WAIT_SECONDS: float = 10.0
+    IDEMPOTENCY_LOCK_SECONDS: int = 60
+    IDEMPOTENCY_PURGE_INTERVAL_SECONDS: int = 3600
+    IDEMPOTENCY_PURGE_BATCH_SIZE: int = 1000
+
+    # Backup Configuration
+    # /api/admin endpoints are disabled unless ADMIN_API_TOKEN is set; callers
+    # send it in the X-Admin-Token header
+    ADMIN_API_TOKEN: Optional[str] = None
+    BACKUP_DIR: str = "./backups"
+    BACKUP_COMPRESS_LEVEL: int = 6
+    BACKUP_BATCH_SIZE: int = 1000
+    BACKUP_HISTORY_SIZE: int = 20
+    # SQLite copies this many pages per step and sleeps between steps, so
+    # writers wait at most one step for the lock
+    BACKUP_SQLITE_PAGES_PER_STEP: int = 256
+    BACKUP_SQLITE_STEP_SLEEP_SECONDS: float = 0.01
+    # Writes restart a SQLite copy; after this many it is redone in one step
+    BACKUP_SQLITE_MAX_RESTARTS: int = 5
     
     model_config = {
         "env_file": ".env",
@@ -0,0 +1,170 @@
+"""Structured JSON access logging that never blocks the request.
+
+The middleware only measures the request and enqueues a small dict; a writer
+thread serializes queued records to JSON lines and writes them in batches.
+Errors (status >= 400, unhandled exceptions) and requests slower than
+``ACCESS_LOG_SLOW_MS`` are always logged; other requests are sampled at
+``ACCESS_LOG_SAMPLE_RATE``. When the bounded queue is full, records are
+dropped and counted instead of waiting for the sink.
+"""
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional, TextIO
+from uuid import uuid4
+from app.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class AccessLog:
+    """Bounded queue of access records drained by one writer thread."""
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        self._queue: queue.Queue = queue.Queue(maxsize=settings.ACCESS_LOG_QUEUE_SIZE)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stream = stream
+        self._owns_stream = False
+        self.stats = {"enqueued": 0, "sampled_out": 0, "dropped": 0, "written": 0, "failed": 0}
+
+    def should_log(self, status_code: int, duration_ms: float) -> bool:
+        """Errors and slow requests always; the rest at the sample rate."""
+        if status_code >= 400 or duration_ms >= settings.ACCESS_LOG_SLOW_MS:
+            return True
+        return random.random() < settings.ACCESS_LOG_SAMPLE_RATE
+
+    def record(self, entry: dict) -> None:
+        """Hand a record to the writer; never blocks."""
+        if not self.should_log(entry["status"], entry["duration_ms"]):
+            self.stats["sampled_out"] += 1
+            return
+        try:
+            self._queue.put_nowait(entry)
+            self.stats["enqueued"] += 1
+        except queue.Full:
+            self.stats["dropped"] += 1
+
+    def start(self) -> None:
+        """Open the sink and start the writer thread."""
+        if self._thread is not None:
+            return
+        if self._stream is None:
+            if settings.ACCESS_LOG_FILE:
+                self._stream = open(settings.ACCESS_LOG_FILE, "a", encoding="utf-8")
+                self._owns_stream = True
+            else:
+                self._stream = sys.stdout
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="access-log-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Flush what is queued and stop the writer."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+        if self._owns_stream:
+            self._stream.close()
+            self._stream, self._owns_stream = None, False
+
+    def _take_batch(self, block: bool = True) -> list[dict]:
+        batch = []
+        deadline = time.monotonic() + settings.ACCESS_LOG_FLUSH_INTERVAL_SECONDS
+        while len(batch) < settings.ACCESS_LOG_BATCH_SIZE:
+            timeout = deadline - time.monotonic()
+            try:
+                if block and timeout > 0:
+                    batch.append(self._queue.get(timeout=timeout))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._write(self._take_batch())
+        while True:
+            batch = self._take_batch(block=False)
+            if not batch:
+                break
+            self._write(batch)
+
+    def _write(self, entries: list[dict]) -> None:
+        """Serialize and write a batch as JSON lines in one call."""
+        if not entries:
+            return
+        try:
+            self._stream.write("".join(json.dumps(entry, default=str) + "\n" for entry in entries))
+            self._stream.flush()
+            self.stats["written"] += len(entries)
+        except Exception:
+            self.stats["failed"] += len(entries)
+            logger.exception("Failed to write %d access log records", len(entries))
+
+
+class AccessLogMiddleware:
+    """Pure ASGI middleware timing each HTTP request for the access log."""
+
+    def __init__(self, app, access_log: Optional[AccessLog] = None):
+        self.app = app
+        self.access_log = access_log
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.ACCESS_LOG_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        response = {"status": 500, "bytes": 0}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["bytes"] += len(message.get("body", b""))
+            await send(message)
+
+        error = None
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            error = repr(exc)
+            raise
+        finally:
+            entry = {
+                "ts": datetime.now(timezone.utc).isoformat(),
+                "request_id": _request_id(scope),
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": response["status"],
+                "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+                "bytes": response["bytes"],
+                "client": scope["client"][0] if scope.get("client") else None,
+            }
+            if scope.get("query_string"):
+                entry["query"] = scope["query_string"].decode("latin-1")
+            if error is not None:
+                entry["error"] = error
+            (self.access_log or access_log).record(entry)
+
+
+def _request_id(scope) -> str:
+    """The caller's X-Request-ID, or a new one."""
+    for name, value in scope.get("headers", ()):
+        if name == b"x-request-id":
+            return value.decode("latin-1")[:128]
+    return uuid4().hex
+
+
+# Global access log instance
+access_log = AccessLog()
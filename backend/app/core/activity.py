@@ -0,0 +1,156 @@
+"""Task activity log with an in-process queue and a batched background writer.
+
+Handlers only compute a field diff and enqueue it; a writer thread flushes
+the queue with one multi-row INSERT per shard every
+``ACTIVITY_FLUSH_INTERVAL_SECONDS`` or ``ACTIVITY_BATCH_SIZE`` entries. The
+queue is bounded, so a stalled database costs dropped (and counted) entries
+rather than memory or request latency. See ``ACTIVITY_LOG_MODE`` in
+``app/config.py`` for the durability trade-off.
+"""
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any, Optional
+from uuid import uuid4
+from sqlalchemy import insert
+from app.config import settings
+from app.database import engine_for_user
+from app.models.activity import TaskActivity
+from app.models.task import Task
+
+
+logger = logging.getLogger(__name__)
+
+TRACKED_FIELDS = ("title", "description", "completed", "priority", "due_date", "tags", "parent_id")
+
+
+def _json_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def task_snapshot(task: Optional[Task]) -> dict:
+    """Tracked field values of a task (empty for a task that doesn't exist)."""
+    if task is None:
+        return {}
+    snapshot = {field: _json_value(getattr(task, field)) for field in TRACKED_FIELDS if field != "tags"}
+    snapshot["tags"] = [tag.tag for tag in task.tags]
+    return snapshot
+
+
+def diff_snapshots(before: dict, after: dict) -> dict:
+    """Field-level changes as {"field": [old, new]}."""
+    return {
+        field: [before.get(field), after.get(field)]
+        for field in TRACKED_FIELDS
+        if before.get(field) != after.get(field)
+    }
+
+
+class ActivityLog:
+    """Bounded queue of activity rows drained by one writer thread."""
+
+    def __init__(self):
+        self._queue: queue.Queue = queue.Queue(maxsize=settings.ACTIVITY_QUEUE_SIZE)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"enqueued": 0, "written": 0, "dropped": 0, "batches": 0, "failed": 0}
+
+    def record(
+        self,
+        user_id: str,
+        task_id: str,
+        action: str,
+        changes: dict,
+        actor_id: Optional[str] = None
+    ) -> None:
+        """Capture one change to a task owned by ``user_id``; never blocks the request in async mode.
+
+        Entries live with the task, on its owner's shard, so everyone with
+        access to a shared task sees one history; ``actor_id`` is who made
+        the change.
+        """
+        if settings.ACTIVITY_LOG_MODE == "off":
+            return
+
+        row = {
+            "id": str(uuid4()),
+            "task_id": task_id,
+            "user_id": user_id,
+            "actor_id": actor_id or user_id,
+            "action": action,
+            "changes": changes,
+            "created_at": datetime.utcnow(),
+        }
+        if settings.ACTIVITY_LOG_MODE == "sync" or self._thread is None:
+            self._write([row])
+            return
+
+        try:
+            self._queue.put_nowait(row)
+            self.stats["enqueued"] += 1
+        except queue.Full:
+            self.stats["dropped"] += 1
+
+    def start(self) -> None:
+        """Start the writer thread (async mode only)."""
+        if settings.ACTIVITY_LOG_MODE != "async" or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="activity-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop accepting queued writes and drain what is left."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+        # Anything enqueued after the writer's final drain
+        self._write(self._take_batch(block=False))
+
+    def _take_batch(self, block: bool = True) -> list[dict]:
+        batch = []
+        deadline = time.monotonic() + settings.ACTIVITY_FLUSH_INTERVAL_SECONDS
+        while len(batch) < settings.ACTIVITY_BATCH_SIZE:
+            timeout = deadline - time.monotonic()
+            try:
+                if block and timeout > 0:
+                    batch.append(self._queue.get(timeout=timeout))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._write(self._take_batch())
+        while True:
+            batch = self._take_batch(block=False)
+            if not batch:
+                break
+            self._write(batch)
+
+    def _write(self, rows: list[dict]) -> None:
+        """One multi-row INSERT per shard."""
+        if not rows:
+            return
+        by_engine: dict = {}
+        for row in rows:
+            by_engine.setdefault(engine_for_user(row["user_id"]), []).append(row)
+        for db_engine, shard_rows in by_engine.items():
+            try:
+                with db_engine.begin() as connection:
+                    connection.execute(insert(TaskActivity), shard_rows)
+                self.stats["written"] += len(shard_rows)
+                self.stats["batches"] += 1
+            except Exception:
+                self.stats["failed"] += len(shard_rows)
+                logger.exception("Failed to write %d activity entries", len(shard_rows))
+
+
+# Global activity log instance
+activity_log = ActivityLog()
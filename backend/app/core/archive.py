@@ -0,0 +1,141 @@
+"""Hot/cold separation: moving old completed tasks to the archive table."""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import and_, delete, insert, literal, or_, select as sa_select, update
+from sqlmodel import Session, select
+from app.config import settings
+from app.database import shard_engines
+from app.models.task import Task, ArchivedTask, TaskTag
+from app.core.tags import set_task_tags
+from app.core.coalesce import read_coalescer
+
+
+logger = logging.getLogger(__name__)
+
+
+def _shared_columns() -> list[str]:
+    """Column names present on both the hot and the archive table."""
+    archived = set(ArchivedTask.__table__.columns.keys())
+    return [name for name in Task.__table__.columns.keys() if name in archived]
+
+
+def _archivable(cutoff: datetime):
+    """Standalone tasks completed before the cutoff."""
+    return and_(
+        Task.completed == True,  # noqa: E712
+        or_(
+            Task.completed_at < cutoff,
+            # Completed before completed_at was recorded
+            and_(Task.completed_at == None, Task.updated_at < cutoff)  # noqa: E711
+        ),
+        # Only standalone tasks; trees stay together so roll-ups stay exact
+        Task.parent_id == None,  # noqa: E711
+        Task.subtask_count == 0
+    )
+
+
+def archive_completed_tasks(
+    session: Session,
+    older_than_days: Optional[int] = None,
+    batch_size: Optional[int] = None
+) -> int:
+    """Move tasks completed more than N days ago into the archive, batch by batch.
+
+    Each batch is copied with INSERT ... SELECT and removed from the hot table
+    in its own transaction, so locks are held only briefly. Both statements
+    repeat the scan's predicate, so a task reopened (or given a subtask)
+    after the scan stays where it is.
+    """
+    if older_than_days is None:
+        older_than_days = settings.ARCHIVE_AFTER_DAYS
+    if batch_size is None:
+        batch_size = settings.ARCHIVE_BATCH_SIZE
+
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    archivable = _archivable(cutoff)
+    columns = _shared_columns()
+    hot = Task.__table__
+    archived_total = 0
+
+    while True:
+        scanned = session.exec(
+            select(Task.id).where(archivable).limit(batch_size)
+        ).all()
+        if not scanned:
+            break
+
+        # Lock the rows where the database supports it (SQLite locks on the INSERT)
+        session.exec(select(Task.id).where(Task.id.in_(scanned)).with_for_update()).all()
+        source = sa_select(
+            *[hot.c[name] for name in columns],
+            literal(datetime.utcnow()).label("archived_at")
+        ).where(hot.c.id.in_(scanned)).where(archivable)
+        session.execute(
+            insert(ArchivedTask.__table__).from_select(columns + ["archived_at"], source)
+        )
+        ids = session.exec(
+            select(ArchivedTask.id).where(ArchivedTask.id.in_(scanned))
+        ).all()
+
+        # Carry tags over as a JSON list on the archived row
+        tags_by_task: dict[str, list[str]] = {}
+        for task_id, tag in session.exec(
+            select(TaskTag.task_id, TaskTag.tag).where(TaskTag.task_id.in_(ids)).order_by(TaskTag.tag)
+        ).all():
+            tags_by_task.setdefault(task_id, []).append(tag)
+        for task_id, tags in tags_by_task.items():
+            session.execute(
+                update(ArchivedTask.__table__)
+                .where(ArchivedTask.__table__.c.id == task_id)
+                .values(tags=tags)
+            )
+        session.execute(delete(TaskTag.__table__).where(TaskTag.__table__.c.task_id.in_(ids)))
+
+        session.execute(delete(hot).where(hot.c.id.in_(ids)).where(archivable))
+        session.commit()
+        archived_total += len(ids)
+
+        if len(scanned) < batch_size:
+            break
+
+    return archived_total
+
+
+def restore_archived_task(session: Session, archived: ArchivedTask) -> Task:
+    """Move an archived task back into the hot table."""
+    data = {name: getattr(archived, name) for name in _shared_columns()}
+    data["updated_at"] = datetime.utcnow()
+    task = Task(**data)
+    task.path = f"{task.id}/"
+    set_task_tags(task, archived.tags or [])
+    session.delete(archived)
+    session.add(task)
+    session.commit()
+    session.refresh(task)
+    return task
+
+
+def run_archive_job() -> int:
+    """Run one archive pass on every shard."""
+    moved = 0
+    for shard_engine in shard_engines:
+        with Session(shard_engine) as session:
+            moved += archive_completed_tasks(session)
+    if moved:
+        read_coalescer.invalidate()
+    return moved
+
+
+async def archive_worker() -> None:
+    """Background loop that periodically archives old completed tasks."""
+    while True:
+        await asyncio.sleep(settings.ARCHIVE_INTERVAL_SECONDS)
+        try:
+            moved = await run_in_threadpool(run_archive_job)
+            if moved:
+                logger.info("Archived %d completed tasks", moved)
+        except Exception:
+            logger.exception("Archive job failed")
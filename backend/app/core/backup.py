@@ -0,0 +1,314 @@
+"""Online backups that don't block writers, plus restore.
+
+SQLite databases are copied with SQLite's online backup API a few pages per
+step, sleeping between steps so writers get the lock back quickly (falling
+back to one step if writes keep restarting the copy); the copy is then
+gzip-compressed. Other databases (PostgreSQL) are exported as
+gzip-compressed JSON lines read inside one REPEATABLE READ, READ ONLY
+transaction, so every table comes from the same snapshot while writers carry
+on. With sharding, every database is backed up to its own file.
+"""
+import gzip
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+from datetime import date, datetime
+from typing import Callable, Optional
+from uuid import uuid4
+from sqlalchemy import Date, DateTime, func, insert, select
+from sqlalchemy.engine import Engine
+from sqlmodel import SQLModel
+from app.config import settings
+from app.database import all_engines
+
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = "todo-app-snapshot"
+# progress(done, total)
+ProgressCallback = Callable[[int, int], None]
+
+
+def _noop(done: int, total: int) -> None:
+    pass
+
+
+def _compress(source: str, target: str) -> None:
+    """Gzip a file into place atomically."""
+    partial = f"{target}.part"
+    with open(source, "rb") as raw, gzip.open(partial, "wb", compresslevel=settings.BACKUP_COMPRESS_LEVEL) as packed:
+        shutil.copyfileobj(raw, packed, 1024 * 1024)
+    os.replace(partial, target)
+
+
+class _TooManyRestarts(Exception):
+    pass
+
+
+def backup_sqlite(db_engine: Engine, target: str, progress: ProgressCallback = _noop) -> int:
+    """Copy a live SQLite database page-batch by page-batch, then compress it.
+
+    If another connection writes mid-copy, SQLite restarts the copy from the
+    first page, so a backup always reflects one consistent state. Under a
+    steady write load that can go on forever, so after
+    ``BACKUP_SQLITE_MAX_RESTARTS`` restarts the copy is redone in a single
+    step, which holds the read lock until it is done. Returns the number of
+    restarts.
+    """
+    fd, scratch = tempfile.mkstemp(suffix=".db", dir=os.path.dirname(target) or ".")
+    os.close(fd)
+    restarts, last_done = 0, 0
+
+    def step(status: int, remaining: int, total: int) -> None:
+        nonlocal restarts, last_done
+        done = total - remaining
+        if done < last_done:
+            restarts += 1
+            if restarts > settings.BACKUP_SQLITE_MAX_RESTARTS:
+                # Aborts the backup call
+                raise _TooManyRestarts
+        last_done = done
+        progress(done, total)
+
+    connection = db_engine.raw_connection()
+    try:
+        destination = sqlite3.connect(scratch)
+        try:
+            try:
+                connection.driver_connection.backup(
+                    destination,
+                    pages=settings.BACKUP_SQLITE_PAGES_PER_STEP,
+                    progress=step,
+                    sleep=settings.BACKUP_SQLITE_STEP_SLEEP_SECONDS
+                )
+            except _TooManyRestarts:
+                logger.warning("SQLite backup restarted %d times; copying in one step", restarts)
+                connection.driver_connection.backup(
+                    destination,
+                    pages=-1,
+                    progress=lambda status, remaining, total: progress(total - remaining, total)
+                )
+        finally:
+            destination.close()
+        _compress(scratch, target)
+    finally:
+        connection.close()
+        os.remove(scratch)
+    return restarts
+
+
+def _json_value(value):
+    return value.isoformat() if isinstance(value, (datetime, date)) else value
+
+
+def export_snapshot(db_engine: Engine, target: str, progress: ProgressCallback = _noop) -> None:
+    """Stream every table from one consistent snapshot into gzip JSON lines.
+
+    Line 1 is a header with row counts; each table then has a
+    ``{"table", "columns"}`` line followed by one JSON array per row.
+    """
+    tables = SQLModel.metadata.sorted_tables
+    partial = f"{target}.part"
+    connection = db_engine.connect()
+    try:
+        if db_engine.dialect.name == "postgresql":
+            connection = connection.execution_options(isolation_level="REPEATABLE READ")
+        with connection.begin():
+            if db_engine.dialect.name == "postgresql":
+                connection.exec_driver_sql("SET TRANSACTION READ ONLY")
+            counts = {
+                table.name: connection.execute(select(func.count()).select_from(table)).scalar_one()
+                for table in tables
+            }
+            total, done = sum(counts.values()), 0
+            progress(done, total)
+
+            with gzip.open(partial, "wt", encoding="utf-8", compresslevel=settings.BACKUP_COMPRESS_LEVEL) as out:
+                out.write(json.dumps({
+                    "format": SNAPSHOT_FORMAT,
+                    "version": 1,
+                    "dialect": db_engine.dialect.name,
+                    "created_at": datetime.utcnow().isoformat(),
+                    "tables": counts,
+                }) + "\n")
+                for table in tables:
+                    columns = list(table.c.keys())
+                    out.write(json.dumps({"table": table.name, "columns": columns}) + "\n")
+                    statement = select(table)
+                    # Self-referencing rows (subtasks) must come after their parents
+                    if "depth" in table.c:
+                        statement = statement.order_by(table.c.depth)
+                    result = connection.execution_options(
+                        stream_results=True, yield_per=settings.BACKUP_BATCH_SIZE
+                    ).execute(statement)
+                    for rows in result.partitions():
+                        out.write("".join(
+                            json.dumps([_json_value(value) for value in row]) + "\n" for row in rows
+                        ))
+                        done += len(rows)
+                        progress(done, total)
+        os.replace(partial, target)
+    finally:
+        connection.close()
+        if os.path.exists(partial):
+            os.remove(partial)
+
+
+def _decoder(column):
+    if isinstance(column.type, DateTime):
+        return lambda value: datetime.fromisoformat(value) if value is not None else None
+    if isinstance(column.type, Date):
+        return lambda value: date.fromisoformat(value) if value is not None else None
+    return lambda value: value
+
+
+def restore_snapshot(db_engine: Engine, source: str, progress: ProgressCallback = _noop) -> int:
+    """Load a JSON lines snapshot into a database with an empty schema; returns rows."""
+    tables = SQLModel.metadata.tables
+    done = 0
+    with gzip.open(source, "rt", encoding="utf-8") as lines, db_engine.begin() as connection:
+        header = json.loads(next(lines))
+        if header.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError(f"{source} is not a {SNAPSHOT_FORMAT} file")
+        total = sum(header["tables"].values())
+        table, columns, decoders, batch = None, [], [], []
+
+        def flush() -> None:
+            nonlocal done
+            if batch:
+                connection.execute(insert(table), batch)
+                done += len(batch)
+                batch.clear()
+                progress(done, total)
+
+        for line in lines:
+            item = json.loads(line)
+            if isinstance(item, dict):
+                flush()
+                table = tables[item["table"]]
+                columns = [name for name in item["columns"] if name in table.c]
+                decoders = [_decoder(table.c[name]) for name in columns]
+                positions = [item["columns"].index(name) for name in columns]
+                continue
+            batch.append({
+                name: decode(item[position])
+                for name, decode, position in zip(columns, decoders, positions)
+            })
+            if len(batch) >= settings.BACKUP_BATCH_SIZE:
+                flush()
+        flush()
+    return done
+
+
+def restore_sqlite(db_engine: Engine, source: str, progress: ProgressCallback = _noop) -> None:
+    """Copy a compressed SQLite backup into the database with the backup API."""
+    fd, scratch = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        with gzip.open(source, "rb") as packed, open(scratch, "wb") as raw:
+            shutil.copyfileobj(packed, raw, 1024 * 1024)
+        backup = sqlite3.connect(scratch)
+        connection = db_engine.raw_connection()
+        try:
+            backup.backup(
+                connection.driver_connection,
+                pages=settings.BACKUP_SQLITE_PAGES_PER_STEP,
+                progress=lambda status, remaining, total: progress(total - remaining, total)
+            )
+        finally:
+            connection.close()
+            backup.close()
+    finally:
+        os.remove(scratch)
+
+
+def backup_file_name(stamp: str, index: int, db_engine: Engine) -> str:
+    """File name for one database of a backup run."""
+    suffix = "db.gz" if db_engine.dialect.name == "sqlite" else "jsonl.gz"
+    return f"backup-{stamp}-db{index}.{suffix}"
+
+
+def backup_database(db_engine: Engine, target: str, progress: ProgressCallback = _noop) -> int:
+    """Back up one database with the method suited to its dialect; returns copy restarts."""
+    if db_engine.dialect.name == "sqlite":
+        return backup_sqlite(db_engine, target, progress)
+    export_snapshot(db_engine, target, progress)
+    return 0
+
+
+def restore_database(db_engine: Engine, source: str, progress: ProgressCallback = _noop) -> None:
+    """Restore one database from a file written by ``backup_database``."""
+    if source.endswith(".db.gz"):
+        if db_engine.dialect.name != "sqlite":
+            raise ValueError("SQLite backups can only be restored into SQLite")
+        restore_sqlite(db_engine, source, progress)
+    else:
+        restore_snapshot(db_engine, source, progress)
+
+
+class BackupJob:
+    """Progress of one backup run over every database."""
+
+    def __init__(self, output_dir: str):
+        self.id = uuid4().hex
+        self.status = "running"
+        self.started_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+        self.error: Optional[str] = None
+        stamp = self.started_at.strftime("%Y%m%dT%H%M%S")
+        self.files = [
+            {
+                "path": os.path.join(output_dir, backup_file_name(stamp, index, db_engine)),
+                "dialect": db_engine.dialect.name,
+                "done": 0,
+                "total": 0,
+                "unit": "pages" if db_engine.dialect.name == "sqlite" else "rows",
+                "restarts": 0,
+            }
+            for index, db_engine in enumerate(all_engines())
+        ]
+
+    def run(self) -> None:
+        try:
+            for entry, db_engine in zip(self.files, all_engines()):
+                def progress(done: int, total: int, entry: dict = entry) -> None:
+                    entry["done"], entry["total"] = done, total
+                entry["restarts"] = backup_database(db_engine, entry["path"], progress)
+                entry["bytes"] = os.path.getsize(entry["path"])
+            self.status = "completed"
+        except Exception as exc:
+            self.status, self.error = "failed", str(exc)
+            logger.exception("Backup %s failed", self.id)
+        finally:
+            self.finished_at = datetime.utcnow()
+
+
+class BackupManager:
+    """Runs at most one backup at a time in a background thread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.jobs: dict[str, BackupJob] = {}
+
+    def start(self, output_dir: Optional[str] = None) -> BackupJob:
+        """Start a backup run; raises RuntimeError if one is in progress."""
+        output_dir = output_dir or settings.BACKUP_DIR
+        os.makedirs(output_dir, exist_ok=True)
+        with self._lock:
+            if any(job.status == "running" for job in self.jobs.values()):
+                raise RuntimeError("A backup is already running")
+            job = BackupJob(output_dir)
+            self.jobs[job.id] = job
+            # Keep the most recent runs only
+            for old_id in list(self.jobs)[:-settings.BACKUP_HISTORY_SIZE]:
+                del self.jobs[old_id]
+        threading.Thread(target=job.run, name=f"backup-{job.id}", daemon=True).start()
+        return job
+
+
+# Global backup manager
+backups = BackupManager()
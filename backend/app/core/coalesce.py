@@ -0,0 +1,77 @@
+"""Single-flight coalescing of identical concurrent reads.
+
+The first request for a (user, key) pair computes the response; identical
+requests arriving while it runs wait for it and get the same serialized
+bytes. Nothing is kept once the computation finishes, so this never serves
+data older than an in-flight query. A write by the user detaches the user's
+in-flight computations, so requests made after the write start a fresh one.
+"""
+import threading
+from typing import Callable, Optional
+from app.config import settings
+
+
+class _Flight:
+    """One in-flight computation and its outcome."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[bytes] = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Shares in-flight read results between identical concurrent requests."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: dict[tuple, _Flight] = {}
+        self.stats = {"executed": 0, "coalesced": 0, "invalidations": 0}
+
+    def run(self, user_id: str, key: tuple, compute: Callable[[], bytes]) -> bytes:
+        """Return compute()'s result, sharing it with identical concurrent calls."""
+        if not settings.READ_COALESCING_ENABLED:
+            return compute()
+
+        flight_key = (user_id, key)
+        with self._lock:
+            flight = self._flights.get(flight_key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[flight_key] = _Flight()
+                self.stats["executed"] += 1
+            else:
+                self.stats["coalesced"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = compute()
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                # A write may already have replaced this flight with a newer one
+                if self._flights.get(flight_key) is flight:
+                    del self._flights[flight_key]
+            flight.done.set()
+        return flight.result
+
+    def invalidate(self, user_id: Optional[str] = None) -> None:
+        """Stop new requests joining reads that started before a write (all users if None)."""
+        with self._lock:
+            stale = [key for key in self._flights if user_id is None or key[0] == user_id]
+            for key in stale:
+                del self._flights[key]
+            self.stats["invalidations"] += 1
+
+
+# Global coalescer for task reads
+read_coalescer = SingleFlight()
@@ -1,12 +1,37 @@
 """Custom exceptions and ownership validation."""
+from typing import Optional, Union
 from fastapi import HTTPException, status
-from app.models.task import Task
+from app.models.series import TaskSeries
+from app.models.task import TaskBase
+from app.core.sharing import Membership, WRITE_ROLES
 
 
-def validate_task_ownership(task: Task, current_user_id: str) -> None:
+def validate_task_ownership(task: Union[TaskBase, TaskSeries], current_user_id: str) -> None:
     """Validate that the task belongs to the current user."""
     if task.user_id != current_user_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You don't have permission to access this task"
         )
+
+
+def validate_task_access(
+    task: TaskBase,
+    current_user_id: str,
+    memberships: dict[str, Membership],
+    write: bool = False
+) -> None:
+    """Validate that the user owns the task or may see (or, with write, edit) its list."""
+    if task.user_id == current_user_id:
+        return
+    membership: Optional[Membership] = memberships.get(task.list_id) if task.list_id else None
+    if membership is None or membership.owner_id != task.user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have permission to access this task"
+        )
+    if write and membership.role not in WRITE_ROLES:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You have read-only access to this list"
+        )
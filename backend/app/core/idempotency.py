@@ -0,0 +1,246 @@
+"""Idempotency keys: run a write once per key and replay its response.
+
+A write sent with an ``Idempotency-Key`` header is keyed by (user, key). The
+first request claims the key with a row on the user's shard, runs, and
+stores its status code and serialized body; retries get that stored response
+without running the write again. Recent responses are also kept in a
+per-process LRU cache, so most replays don't touch the database at all.
+
+Concurrent duplicates wait for the first request instead of running: within
+a process on an event, across processes by polling the claim row. Reusing a
+key for a different request is rejected, and writes that fail release the
+key so the client can retry.
+"""
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Callable, NamedTuple, Optional
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+from app.config import settings
+from app.database import engine_for_user, shard_engines
+from app.models.idempotency import IdempotencyKey
+
+
+logger = logging.getLogger(__name__)
+
+# How often a worker re-reads a claim held by another process
+POLL_INTERVAL_SECONDS = 0.05
+
+
+class StoredResponse(NamedTuple):
+    """What a replay sends back."""
+    status_code: int
+    body: bytes
+
+
+def request_fingerprint(*parts) -> str:
+    """Hash identifying the operation and request a key was first used for."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _mismatch() -> HTTPException:
+    return HTTPException(
+        status_code=422,
+        detail="Idempotency-Key was already used for a different request"
+    )
+
+
+def _still_running() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="A request with this Idempotency-Key is still in progress"
+    )
+
+
+class IdempotencyStore:
+    """Per-process LRU cache and in-flight tracking over the database rows."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, str], tuple[float, str, StoredResponse]] = OrderedDict()
+        self._in_flight: dict[tuple[str, str], tuple[str, threading.Event]] = {}
+        self.stats = {"executed": 0, "replayed": 0, "waited": 0, "conflicts": 0}
+
+    def run(
+        self,
+        user_id: str,
+        key: str,
+        fingerprint: str,
+        compute: Callable[[], StoredResponse]
+    ) -> tuple[StoredResponse, bool]:
+        """The response for this key, computing it only if it's new; also whether it was replayed."""
+        scope = (user_id, key)
+        deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+        while True:
+            with self._lock:
+                cached = self._cached(scope, fingerprint)
+                if cached is not None:
+                    self.stats["replayed"] += 1
+                    return cached, True
+                flight = self._in_flight.get(scope)
+                if flight is None:
+                    event = threading.Event()
+                    self._in_flight[scope] = (fingerprint, event)
+                    break
+                self.stats["waited"] += 1
+            if flight[0] != fingerprint:
+                raise self._conflict(_mismatch())
+            if not flight[1].wait(max(deadline - time.monotonic(), 0)):
+                raise self._conflict(_still_running())
+
+        try:
+            stored = self._claim(user_id, key, fingerprint, deadline)
+            if stored is not None:
+                replayed = True
+                self.stats["replayed"] += 1
+            else:
+                replayed = False
+                try:
+                    stored = compute()
+                except BaseException:
+                    self._release(user_id, key)
+                    raise
+                self._complete(user_id, key, stored)
+                self.stats["executed"] += 1
+            with self._lock:
+                self._entries[scope] = (time.monotonic() + settings.IDEMPOTENCY_TTL_SECONDS, fingerprint, stored)
+                self._entries.move_to_end(scope)
+                while len(self._entries) > settings.IDEMPOTENCY_CACHE_SIZE:
+                    self._entries.popitem(last=False)
+            return stored, replayed
+        finally:
+            with self._lock:
+                self._in_flight.pop(scope, None)
+            event.set()
+
+    def _cached(self, scope: tuple[str, str], fingerprint: str) -> Optional[StoredResponse]:
+        entry = self._entries.get(scope)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[scope]
+            return None
+        if entry[1] != fingerprint:
+            raise self._conflict(_mismatch())
+        self._entries.move_to_end(scope)
+        return entry[2]
+
+    def _conflict(self, exc: HTTPException) -> HTTPException:
+        self.stats["conflicts"] += 1
+        return exc
+
+    def _claim(self, user_id: str, key: str, fingerprint: str, deadline: float) -> Optional[StoredResponse]:
+        """Insert the claim row; a stored response if the key was already used."""
+        with Session(engine_for_user(user_id)) as session:
+            while True:
+                now = datetime.utcnow()
+                session.add(IdempotencyKey(
+                    user_id=user_id,
+                    key=key,
+                    fingerprint=fingerprint,
+                    expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_LOCK_SECONDS)
+                ))
+                try:
+                    session.commit()
+                    return None
+                except IntegrityError:
+                    session.rollback()
+
+                row = session.get(IdempotencyKey, (user_id, key), populate_existing=True)
+                if row is None:
+                    continue
+                if row.expires_at <= now:
+                    # Expired response, or a claim whose worker died
+                    session.delete(row)
+                    session.commit()
+                    continue
+                if row.fingerprint != fingerprint:
+                    raise self._conflict(_mismatch())
+                if row.status_code is not None:
+                    return StoredResponse(row.status_code, row.body or b"")
+                # Another process is running the first request
+                if time.monotonic() >= deadline:
+                    raise self._conflict(_still_running())
+                self.stats["waited"] += 1
+                session.expunge(row)
+                time.sleep(POLL_INTERVAL_SECONDS)
+
+    def _complete(self, user_id: str, key: str, stored: StoredResponse) -> None:
+        with Session(engine_for_user(user_id)) as session:
+            row = session.get(IdempotencyKey, (user_id, key))
+            if row is None:
+                return
+            row.status_code, row.body = stored
+            row.expires_at = datetime.utcnow() + timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS)
+            session.add(row)
+            session.commit()
+
+    def _release(self, user_id: str, key: str) -> None:
+        try:
+            with Session(engine_for_user(user_id)) as session:
+                session.execute(
+                    delete(IdempotencyKey)
+                    .where(IdempotencyKey.user_id == user_id)
+                    .where(IdempotencyKey.key == key)
+                    .where(IdempotencyKey.status_code == None)  # noqa: E711
+                )
+                session.commit()
+        except Exception:
+            # The claim expires after IDEMPOTENCY_LOCK_SECONDS anyway
+            logger.exception("Failed to release idempotency key")
+
+
+def purge_expired_keys(session: Session) -> int:
+    """Delete expired keys in batches; returns the number removed."""
+    removed = 0
+    while True:
+        batch = session.exec(
+            select(IdempotencyKey.user_id, IdempotencyKey.key)
+            .where(IdempotencyKey.expires_at < datetime.utcnow())
+            .limit(settings.IDEMPOTENCY_PURGE_BATCH_SIZE)
+        ).all()
+        if not batch:
+            return removed
+        session.execute(
+            delete(IdempotencyKey)
+            .where(tuple_(IdempotencyKey.user_id, IdempotencyKey.key).in_(batch))
+        )
+        session.commit()
+        removed += len(batch)
+
+
+def run_purge_job() -> int:
+    """Purge expired keys on every shard."""
+    removed = 0
+    for shard_engine in shard_engines:
+        with Session(shard_engine) as session:
+            removed += purge_expired_keys(session)
+    return removed
+
+
+async def idempotency_purge_worker() -> None:
+    """Background loop that periodically removes expired idempotency keys."""
+    while True:
+        await asyncio.sleep(settings.IDEMPOTENCY_PURGE_INTERVAL_SECONDS)
+        try:
+            removed = await run_in_threadpool(run_purge_job)
+            if removed:
+                logger.info("Purged %d expired idempotency keys", removed)
+        except Exception:
+            logger.exception("Idempotency key purge failed")
+
+
+# Global idempotency store
+idempotency_store = IdempotencyStore()
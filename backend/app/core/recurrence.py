@@ -0,0 +1,195 @@
+"""Recurring tasks: lazy occurrence expansion and materialization.
+
+A series stores its rule once. Listing a due-date window expands the rule
+for that window only, and an occurrence becomes a ``tasks`` row only when
+the user completes, edits or deletes it. Occurrences that are not real rows
+yet are addressed by a synthetic id (see ``occurrence_id``).
+"""
+import calendar
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, Optional
+from sqlalchemy import or_, union_all
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+from app.config import settings
+from app.models.series import TaskSeries
+from app.models.task import Task, ArchivedTask
+from app.core.tags import set_task_tags
+from app.core.stats import record_stats, stats_state
+
+
+OCCURRENCE_PREFIX = "series:"
+_STAMP_FORMAT = "%Y%m%dT%H%M%S"
+
+
+def normalize_datetime(value: Optional[datetime]) -> Optional[datetime]:
+    """Naive UTC with whole seconds, so computed occurrences compare equal to stored ones."""
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.replace(microsecond=0)
+
+
+def occurrence_id(series_id: str, at: datetime) -> str:
+    """Synthetic task id of an occurrence that isn't materialized."""
+    return f"{OCCURRENCE_PREFIX}{series_id}:{at.strftime(_STAMP_FORMAT)}"
+
+
+def parse_occurrence_id(task_id: str) -> Optional[tuple[str, datetime]]:
+    """Split a synthetic occurrence id into series id and timestamp."""
+    if not task_id.startswith(OCCURRENCE_PREFIX):
+        return None
+    try:
+        series_id, stamp = task_id[len(OCCURRENCE_PREFIX):].rsplit(":", 1)
+        return series_id, datetime.strptime(stamp, _STAMP_FORMAT)
+    except ValueError:
+        return None
+
+
+def _add_months(value: datetime, months: int) -> datetime:
+    """Shift by whole months, clamping the day (Jan 31 + 1 month = Feb 28/29)."""
+    year, month = divmod(value.month - 1 + months, 12)
+    year += value.year
+    day = min(value.day, calendar.monthrange(year, month + 1)[1])
+    return value.replace(year=year, month=month + 1, day=day)
+
+
+def _candidates(series: TaskSeries, start: datetime) -> Iterator[tuple[int, datetime]]:
+    """(index, time) of occurrences, jumping straight to the first one near `start`."""
+    first = series.starts_at
+    if series.frequency == "monthly":
+        months = (start.year - first.year) * 12 + (start.month - first.month)
+        index = max(0, months // series.interval - 1)
+        while True:
+            yield index, _add_months(first, index * series.interval)
+            index += 1
+    else:
+        step = timedelta(days=series.interval * (7 if series.frequency == "weekly" else 1))
+        index = max(0, (start - first) // step)
+        while True:
+            yield index, first + index * step
+            index += 1
+
+
+def expand(series: TaskSeries, start: datetime, end: datetime, limit: Optional[int] = None) -> list[datetime]:
+    """Occurrence times of a series in [start, end), skipping deleted ones."""
+    limit = limit or settings.RECURRENCE_MAX_OCCURRENCES
+    skipped = set(series.skipped or [])
+    found = []
+    for index, at in _candidates(series, start):
+        if at >= end:
+            break
+        if series.until is not None and at > series.until:
+            break
+        if series.count is not None and index >= series.count:
+            break
+        if at >= start and at.isoformat() not in skipped:
+            found.append(at)
+            if len(found) >= limit:
+                break
+    return found
+
+
+def is_occurrence(series: TaskSeries, at: datetime) -> bool:
+    """Whether `at` is a live occurrence of the series."""
+    return expand(series, at, at + timedelta(seconds=1), 1) == [at]
+
+
+def skip_occurrence(series: TaskSeries, at: datetime) -> None:
+    """Stop an occurrence from being generated again."""
+    series.skipped = [*(series.skipped or []), at.isoformat()]
+    series.updated_at = datetime.utcnow()
+
+
+def _materialized_keys(session: Session, series_ids: list[str], start: datetime, end: datetime) -> set:
+    """(series_id, occurrence_at) pairs that already have a hot or archived row."""
+    statements = [
+        select(model.series_id, model.occurrence_at)
+        .where(model.series_id.in_(series_ids))
+        .where(model.occurrence_at >= start)
+        .where(model.occurrence_at < end)
+        for model in (Task, ArchivedTask)
+    ]
+    return {tuple(row) for row in session.execute(union_all(*statements)).all()}
+
+
+def virtual_task(series: TaskSeries, at: datetime) -> dict:
+    """An unmaterialized occurrence shaped like a task response."""
+    return {
+        "id": occurrence_id(series.id, at),
+        "title": series.title,
+        "description": series.description,
+        "completed": False,
+        "priority": series.priority,
+        "due_date": at,
+        "user_id": series.user_id,
+        "created_at": series.created_at,
+        "updated_at": series.updated_at,
+        "tags": series.tags or [],
+        "series_id": series.id,
+        "occurrence_at": at,
+        "virtual": True,
+    }
+
+
+def virtual_occurrences(session: Session, user_id: str, start: datetime, end: datetime) -> list[dict]:
+    """Expand every series of a user over a window, minus materialized occurrences."""
+    series_list = session.exec(
+        select(TaskSeries)
+        .where(TaskSeries.user_id == user_id)
+        .where(TaskSeries.starts_at < end)
+        .where(or_(TaskSeries.until == None, TaskSeries.until >= start))  # noqa: E711
+    ).all()
+    if not series_list:
+        return []
+
+    taken = _materialized_keys(session, [series.id for series in series_list], start, end)
+    return [
+        virtual_task(series, at)
+        for series in series_list
+        for at in expand(series, start, end)
+        if (series.id, at) not in taken
+    ]
+
+
+def find_occurrence_series(session: Session, user_id: str, task_id: str) -> Optional[tuple[TaskSeries, datetime]]:
+    """Resolve a synthetic id to its series and time if it's a live occurrence."""
+    parsed = parse_occurrence_id(task_id)
+    if parsed is None:
+        return None
+    series = session.get(TaskSeries, parsed[0])
+    if series is None or series.user_id != user_id or not is_occurrence(series, parsed[1]):
+        return None
+    return series, parsed[1]
+
+
+def materialize_occurrence(session: Session, series: TaskSeries, at: datetime) -> Task:
+    """Turn an occurrence into a real task row (or return the existing one)."""
+    existing = session.exec(
+        select(Task).where(Task.series_id == series.id).where(Task.occurrence_at == at)
+    ).first()
+    if existing:
+        return existing
+
+    task = Task(
+        title=series.title,
+        description=series.description,
+        priority=series.priority,
+        due_date=at,
+        user_id=series.user_id,
+        series_id=series.id,
+        occurrence_at=at
+    )
+    task.path = f"{task.id}/"
+    set_task_tags(task, series.tags or [])
+    try:
+        with session.begin_nested():
+            session.add(task)
+            record_stats(session, series.user_id, after=[stats_state(task)])
+    except IntegrityError:
+        # A concurrent request materialized it first
+        return session.exec(
+            select(Task).where(Task.series_id == series.id).where(Task.occurrence_at == at)
+        ).one()
+    return task
@@ -0,0 +1,154 @@
+"""Token revocation denylist backed by an in-memory Bloom filter.
+
+The filter answers "definitely not revoked" for almost every request without
+touching the database. Only when it reports a possible match do we consult
+the authoritative ``revoked_tokens`` table. Each worker keeps its own filter
+and pulls entries revoked by other workers every ``DENYLIST_SYNC_SECONDS``.
+Bloom filters cannot delete, so the filter is periodically rebuilt from the
+unexpired rows, which also purges expired entries from the table.
+"""
+import asyncio
+import hashlib
+import logging
+import math
+import threading
+from datetime import datetime, timedelta
+from typing import Optional
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+from app.config import settings
+from app.database import engine
+from app.models.token import RevokedToken
+
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter using double hashing over one blake2b digest."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(64, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class TokenDenylist:
+    """Per-worker view of the revoked token table."""
+
+    def __init__(self):
+        self._filter = self._new_filter()
+        self._lock = threading.Lock()
+        self._synced_at: Optional[datetime] = None
+        self.stats = {"checks": 0, "filter_positives": 0, "false_positives": 0}
+
+    @staticmethod
+    def _new_filter() -> BloomFilter:
+        return BloomFilter(settings.DENYLIST_BLOOM_CAPACITY, settings.DENYLIST_BLOOM_ERROR_RATE)
+
+    def revoke(self, session: Session, jti: str, user_id: str, expires_at: datetime) -> bool:
+        """Add a token to the authoritative store and the local filter.
+
+        Returns False if the token was already revoked, including by a
+        concurrent request that inserted the row first.
+        """
+        if expires_at <= datetime.utcnow():
+            return True
+        session.add(RevokedToken(jti=jti, user_id=user_id, expires_at=expires_at))
+        try:
+            session.commit()
+            revoked = True
+        except IntegrityError:
+            session.rollback()
+            revoked = False
+        with self._lock:
+            self._filter.add(jti)
+        return revoked
+
+    def is_revoked(self, jti: str) -> bool:
+        """Check a token id; hits the database only on a filter match."""
+        self.stats["checks"] += 1
+        if jti not in self._filter:
+            return False
+
+        self.stats["filter_positives"] += 1
+        with Session(engine) as session:
+            revoked = session.get(RevokedToken, jti) is not None
+        if not revoked:
+            self.stats["false_positives"] += 1
+        return revoked
+
+    def sync(self, session: Session) -> int:
+        """Pull entries revoked by other workers since the last sync."""
+        statement = select(RevokedToken.jti).where(RevokedToken.expires_at > datetime.utcnow())
+        if self._synced_at is not None:
+            # Overlap the window so clock skew between workers can't drop entries
+            since = self._synced_at - timedelta(seconds=2 * settings.DENYLIST_SYNC_SECONDS)
+            statement = statement.where(RevokedToken.revoked_at >= since)
+        self._synced_at = datetime.utcnow()
+
+        jtis = session.exec(statement).all()
+        with self._lock:
+            for jti in jtis:
+                self._filter.add(jti)
+        return len(jtis)
+
+    def rebuild(self, session: Session) -> int:
+        """Purge expired entries and rebuild the filter from the live ones."""
+        now = datetime.utcnow()
+        session.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+        session.commit()
+
+        fresh = self._new_filter()
+        jtis = session.exec(select(RevokedToken.jti)).all()
+        for jti in jtis:
+            fresh.add(jti)
+        with self._lock:
+            self._filter = fresh
+            self._synced_at = now
+        return len(jtis)
+
+
+# Global denylist instance
+denylist = TokenDenylist()
+
+
+def _sync_denylist() -> None:
+    with Session(engine) as session:
+        denylist.sync(session)
+
+
+def _rebuild_denylist() -> None:
+    with Session(engine) as session:
+        denylist.rebuild(session)
+
+
+async def denylist_worker() -> None:
+    """Background loop that keeps this worker's filter in sync."""
+    last_rebuild: Optional[datetime] = None
+    while True:
+        try:
+            rebuild_every = timedelta(seconds=settings.DENYLIST_REBUILD_SECONDS)
+            if last_rebuild is None or datetime.utcnow() - last_rebuild >= rebuild_every:
+                await run_in_threadpool(_rebuild_denylist)
+                last_rebuild = datetime.utcnow()
+            else:
+                await run_in_threadpool(_sync_denylist)
+        except Exception:
+            logger.exception("Token denylist sync failed")
+        await asyncio.sleep(settings.DENYLIST_SYNC_SECONDS)
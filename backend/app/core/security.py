@@ -1,11 +1,14 @@
 """JWT verification and authentication."""
 from typing import Annotated
 from datetime import datetime, timedelta
+from uuid import uuid4
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlmodel import Session
 import jwt
 from passlib.context import CryptContext
 from app.config import settings
+from app.core.revocation import denylist
 
 
 security = HTTPBearer()
@@ -22,29 +25,42 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
-def create_access_token(user_id: str, email: str) -> str:
-    """Create a JWT access token."""
+def _create_token(user_id: str, email: str, token_type: str, expires_delta: timedelta) -> str:
+    """Create a signed JWT with a unique id so it can be revoked."""
     payload = {
         "sub": user_id,
         "email": email,
-        "exp": datetime.utcnow() + timedelta(days=7)
+        "type": token_type,
+        "jti": uuid4().hex,
+        "exp": datetime.utcnow() + expires_delta
     }
     return jwt.encode(payload, settings.BETTER_AUTH_SECRET, algorithm="HS256")
 
 
-def verify_token(
-    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)]
-) -> dict:
-    """Verify JWT token and return payload."""
-    token = credentials.credentials
+def create_access_token(user_id: str, email: str) -> str:
+    """Create a short-lived JWT access token."""
+    return _create_token(
+        user_id, email, "access",
+        timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+
 
+def create_refresh_token(user_id: str, email: str) -> str:
+    """Create a long-lived JWT refresh token."""
+    return _create_token(
+        user_id, email, "refresh",
+        timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    )
+
+
+def decode_token(token: str, expected_type: str = "access") -> dict:
+    """Decode a JWT, check its type and make sure it hasn't been revoked."""
     try:
         payload = jwt.decode(
             token,
             settings.BETTER_AUTH_SECRET,
             algorithms=["HS256"]
         )
-        return payload
     except jwt.ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -56,6 +72,42 @@ def verify_token(
             detail="Invalid token"
         )
 
+    # Tokens issued before revocation support carry no type and count as access tokens
+    if payload.get("type", "access") != expected_type:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token type"
+        )
+
+    jti = payload.get("jti")
+    if jti and denylist.is_revoked(jti):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token revoked"
+        )
+
+    return payload
+
+
+def verify_token(
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)]
+) -> dict:
+    """Verify JWT access token and return payload."""
+    return decode_token(credentials.credentials)
+
+
+def revoke_token(session: Session, payload: dict) -> bool:
+    """Add a decoded token to the denylist until it expires; False if it already was."""
+    jti = payload.get("jti")
+    if not jti:
+        return True
+    return denylist.revoke(
+        session,
+        jti,
+        payload.get("sub", ""),
+        datetime.utcfromtimestamp(payload["exp"])
+    )
+
 
 def get_current_user_id(
     token_payload: Annotated[dict, Depends(verify_token)]
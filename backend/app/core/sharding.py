@@ -0,0 +1,149 @@
+"""User directory and shard placement helpers."""
+from typing import Optional
+from sqlalchemy import delete, insert, inspect, select as sa_select
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, SQLModel, select
+from app.database import engine, engine_for_user, is_sharded
+from app.models.user import User, UserDirectory
+
+
+# Tables that only ever live on the primary database
+PRIMARY_ONLY_TABLES = {"user_directory", "revoked_tokens", "list_members", "membership_changes"}
+# Users per directory backfill query
+REGISTER_BATCH_SIZE = 500
+
+
+def find_user_by_email(session: Session, email: str) -> Optional[User]:
+    """Look a user up by email, going through the directory when sharded."""
+    if not is_sharded():
+        return session.exec(select(User).where(User.email == email)).first()
+
+    entry = session.get(UserDirectory, email)
+    if not entry:
+        return None
+    with Session(engine_for_user(entry.user_id)) as shard_session:
+        return shard_session.get(User, entry.user_id)
+
+
+def create_user(session: Session, user: User) -> User:
+    """Persist a new user on its shard and register it in the directory.
+
+    Raises ``IntegrityError`` when the email is already taken.
+    """
+    if not is_sharded():
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+        return user
+
+    # Claim the email first so concurrent signups can't both succeed
+    entry = UserDirectory(email=user.email, user_id=user.id)
+    session.add(entry)
+    session.commit()
+
+    try:
+        with Session(engine_for_user(user.id)) as shard_session:
+            shard_session.add(user)
+            shard_session.commit()
+            shard_session.refresh(user)
+    except Exception:
+        session.delete(entry)
+        session.commit()
+        raise
+    return user
+
+
+def user_tables() -> list:
+    """Tables holding per-user rows, parents first.
+
+    Every per-user table carries a ``user_id`` column so a user's rows can be
+    moved between shards without knowing the schema.
+    """
+    return [
+        table for table in SQLModel.metadata.sorted_tables
+        if table.name == "users"
+        or ("user_id" in table.c and table.name not in PRIMARY_ONLY_TABLES)
+    ]
+
+
+def check_user_tables(db_engine: Engine) -> None:
+    """Fail if a database has per-user tables that ``user_tables`` would not move.
+
+    That happens when a model isn't registered with the metadata; moving users
+    anyway would leave part of their data behind on the old shard.
+    """
+    known = {table.name for table in user_tables()} | PRIMARY_ONLY_TABLES
+    inspector = inspect(db_engine)
+    unknown = sorted(
+        name for name in inspector.get_table_names()
+        if name not in known and any(column["name"] == "user_id" for column in inspector.get_columns(name))
+    )
+    if unknown:
+        raise RuntimeError(
+            f"Per-user tables on {db_engine.url!r} have no registered model: {', '.join(unknown)}"
+        )
+
+
+def register_users(source: Engine, dry_run: bool = False) -> int:
+    """Add directory entries for users on a database that have none.
+
+    Users created before sharding was enabled never went through
+    ``create_user``, and sharded logins and email lookups only consult the
+    directory. Returns the number of entries added (or missing, on a dry run).
+    """
+    with Session(source) as src:
+        users = src.exec(select(User.id, User.email)).all()
+
+    added = 0
+    with Session(engine) as session:
+        for start in range(0, len(users), REGISTER_BATCH_SIZE):
+            batch = dict(users[start:start + REGISTER_BATCH_SIZE])
+            registered = dict(session.exec(
+                select(UserDirectory.user_id, UserDirectory.email)
+                .where(UserDirectory.user_id.in_(list(batch)))
+            ).all())
+            missing = {user_id: email for user_id, email in batch.items() if registered.get(user_id) != email}
+            taken = session.exec(
+                select(UserDirectory.email).where(UserDirectory.email.in_(list(missing.values())))
+            ).all()
+            if taken:
+                raise RuntimeError(
+                    f"Emails on {source.url!r} are registered to other users: {', '.join(sorted(taken))}"
+                )
+            added += len(missing)
+            if dry_run or not missing:
+                continue
+            # Entries left behind by an email change point at the old address
+            session.execute(delete(UserDirectory).where(UserDirectory.user_id.in_(list(missing))))
+            session.add_all(UserDirectory(email=email, user_id=user_id) for user_id, email in missing.items())
+            session.commit()
+    return added
+
+
+def _user_key(table, user_id: str):
+    return (table.c.id if table.name == "users" else table.c.user_id) == user_id
+
+
+def move_user(user_id: str, source: Engine, target: Engine) -> int:
+    """Copy a user's rows to another shard, then delete them from the source.
+
+    The target is cleared for the user first, so an interrupted move can be
+    safely re-run. Returns the number of rows moved.
+    """
+    tables = user_tables()
+    moved = 0
+
+    with source.connect() as src, target.begin() as dst:
+        for table in reversed(tables):
+            dst.execute(delete(table).where(_user_key(table, user_id)))
+        for table in tables:
+            rows = [dict(row._mapping) for row in src.execute(sa_select(table).where(_user_key(table, user_id)))]
+            if rows:
+                dst.execute(insert(table), rows)
+                moved += len(rows)
+
+    with source.begin() as src:
+        for table in reversed(tables):
+            src.execute(delete(table).where(_user_key(table, user_id)))
+
+    return moved
@@ -0,0 +1,136 @@
+"""Shared lists: cached membership lookups and role checks.
+
+A user's memberships (list id -> role and list owner) are loaded with one
+query on the ``(user_id, list_id, role)`` index and cached per process for
+``MEMBERSHIP_CACHE_TTL_SECONDS``. Membership changes invalidate the affected
+users' entries right away in this process and are logged to
+``membership_changes``; every worker pulls that log each
+``MEMBERSHIP_SYNC_SECONDS`` (like the token denylist), so a revoked member
+loses access everywhere within about a second.
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Iterable, NamedTuple, Optional
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete
+from sqlmodel import Session, select
+from app.config import settings
+from app.database import engine
+from app.models.task_list import ListMember, MembershipChange, TaskList
+
+
+logger = logging.getLogger(__name__)
+
+
+ROLES = ("viewer", "editor", "owner")
+WRITE_ROLES = ("editor", "owner")
+
+
+class Membership(NamedTuple):
+    """A user's access to one list."""
+    role: str
+    owner_id: str
+
+
+def load_memberships(session: Session, user_id: str) -> dict[str, Membership]:
+    """Every list the user can access, in one indexed query."""
+    rows = session.exec(
+        select(ListMember.list_id, ListMember.role, TaskList.owner_id)
+        .join(TaskList, TaskList.id == ListMember.list_id)
+        .where(ListMember.user_id == user_id)
+    ).all()
+    return {list_id: Membership(role, owner_id) for list_id, role, owner_id in rows}
+
+
+class MembershipCache:
+    """LRU cache of each user's memberships with a TTL."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._synced_at: Optional[datetime] = None
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0, "remote_invalidations": 0}
+
+    def get(self, user_id: str) -> dict[str, Membership]:
+        """A user's memberships, from cache when fresh."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(user_id)
+                self.stats["hits"] += 1
+                return entry[1]
+            self.stats["misses"] += 1
+
+        with Session(engine) as session:
+            memberships = load_memberships(session, user_id)
+
+        with self._lock:
+            self._entries[user_id] = (now + settings.MEMBERSHIP_CACHE_TTL_SECONDS, memberships)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > settings.MEMBERSHIP_CACHE_SIZE:
+                self._entries.popitem(last=False)
+        return memberships
+
+    def invalidate(self, user_ids: Iterable[str]) -> None:
+        """Drop cached memberships after they changed, here and on other workers."""
+        user_ids = list(user_ids)
+        self._drop(user_ids)
+        self.stats["invalidations"] += 1
+        with Session(engine) as session:
+            session.add_all(MembershipChange(user_id=user_id) for user_id in user_ids)
+            session.commit()
+
+    def _drop(self, user_ids: Iterable[str]) -> None:
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+    def sync(self, session: Session) -> int:
+        """Drop entries of users whose memberships changed on other workers."""
+        now = datetime.utcnow()
+        # Entries loaded before the last TTL have expired anyway
+        since = now - timedelta(seconds=settings.MEMBERSHIP_CACHE_TTL_SECONDS)
+        if self._synced_at is not None:
+            # Overlap the window so clock skew between workers can't drop changes
+            since = max(since, self._synced_at - timedelta(seconds=2 * settings.MEMBERSHIP_SYNC_SECONDS))
+        self._synced_at = now
+
+        user_ids = session.exec(
+            select(MembershipChange.user_id).where(MembershipChange.changed_at >= since)
+        ).all()
+        self._drop(user_ids)
+        self.stats["remote_invalidations"] += len(user_ids)
+        return len(user_ids)
+
+
+# Global membership cache
+membership_cache = MembershipCache()
+
+
+def _sync_memberships(purge: bool) -> None:
+    with Session(engine) as session:
+        membership_cache.sync(session)
+        if purge:
+            # Changes older than the TTL no longer matter to any cache
+            cutoff = datetime.utcnow() - timedelta(seconds=2 * settings.MEMBERSHIP_CACHE_TTL_SECONDS)
+            session.execute(delete(MembershipChange).where(MembershipChange.changed_at < cutoff))
+            session.commit()
+
+
+async def membership_sync_worker() -> None:
+    """Background loop applying other workers' membership changes to this cache."""
+    last_purge = time.monotonic()
+    while True:
+        await asyncio.sleep(settings.MEMBERSHIP_SYNC_SECONDS)
+        try:
+            purge = time.monotonic() - last_purge >= settings.MEMBERSHIP_CACHE_TTL_SECONDS
+            await run_in_threadpool(_sync_memberships, purge)
+            if purge:
+                last_purge = time.monotonic()
+        except Exception:
+            logger.exception("Membership cache sync failed")
@@ -0,0 +1,236 @@
+"""Daily per-user task statistics, maintained incrementally.
+
+Every task write turns the task's before/after state into per-day counter
+deltas and appends them to ``task_daily_stats`` in the same transaction.
+A task counts as created on its creation day, completed on its completion
+day, and overdue from its due day until the day it is completed or deleted
+(a task completed on its due day never counts). Range queries sum the
+deltas; a background job periodically merges each user-day into one row.
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Iterable, NamedTuple, Optional
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, func, tuple_
+from sqlmodel import Session, select
+from app.config import settings
+from app.database import shard_engines
+from app.models.stats import DailyTaskStats
+from app.models.task import Task, ArchivedTask
+
+
+logger = logging.getLogger(__name__)
+
+COUNTERS = ("created", "completed", "overdue_delta")
+
+
+class StatsState(NamedTuple):
+    """The task fields that statistics depend on."""
+    created_at: datetime
+    completed_at: Optional[datetime]
+    due_date: Optional[datetime]
+    # When a task stopped existing (deleted), which ends its overdue period
+    closed_at: Optional[datetime] = None
+
+
+def stats_state(task: Task, closed_at: Optional[datetime] = None) -> StatsState:
+    """Statistics-relevant state of a task."""
+    return StatsState(task.created_at, task.completed_at, task.due_date, closed_at)
+
+
+def add_contributions(deltas: dict, state: StatsState, sign: int = 1) -> None:
+    """Add (or with sign=-1, remove) a task state's per-day counters."""
+    deltas[state.created_at.date()]["created"] += sign
+    if state.completed_at is not None:
+        deltas[state.completed_at.date()]["completed"] += sign
+    if state.due_date is not None:
+        due_day = state.due_date.date()
+        end = state.completed_at or state.closed_at
+        if end is None or end.date() > due_day:
+            deltas[due_day]["overdue_delta"] += sign
+            if end is not None:
+                deltas[end.date()]["overdue_delta"] -= sign
+
+
+def _new_deltas() -> dict:
+    return defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+
+
+def record_stats(
+    session: Session,
+    user_id: str,
+    before: Iterable[StatsState] = (),
+    after: Iterable[StatsState] = ()
+) -> None:
+    """Append the difference between before and after states; caller commits."""
+    deltas = _new_deltas()
+    for state in before:
+        add_contributions(deltas, state, -1)
+    for state in after:
+        add_contributions(deltas, state)
+    for day, counts in sorted(deltas.items()):
+        if any(counts.values()):
+            session.add(DailyTaskStats(user_id=user_id, day=day, **counts))
+
+
+def record_deletion(session: Session, user_id: str, condition) -> None:
+    """End the overdue period of open tasks about to be deleted by `condition`."""
+    now = datetime.utcnow()
+    rows = session.exec(
+        select(Task.created_at, Task.due_date)
+        .where(condition)
+        .where(Task.completed == False)  # noqa: E712
+        .where(Task.due_date != None)  # noqa: E711
+    ).all()
+    record_stats(
+        session,
+        user_id,
+        before=[StatsState(created_at, None, due_date) for created_at, due_date in rows],
+        after=[StatsState(created_at, None, due_date, now) for created_at, due_date in rows]
+    )
+
+
+def daily_stats(session: Session, user_id: str, start: date, end: date) -> list[dict]:
+    """Created, completed and overdue counts for each day in [start, end]."""
+    # Overdue is a running total, so it starts from everything before the range
+    overdue = session.exec(
+        select(func.coalesce(func.sum(DailyTaskStats.overdue_delta), 0))
+        .where(DailyTaskStats.user_id == user_id)
+        .where(DailyTaskStats.day < start)
+    ).one()
+    rows = session.exec(
+        select(
+            DailyTaskStats.day,
+            func.sum(DailyTaskStats.created),
+            func.sum(DailyTaskStats.completed),
+            func.sum(DailyTaskStats.overdue_delta)
+        )
+        .where(DailyTaskStats.user_id == user_id)
+        .where(DailyTaskStats.day >= start)
+        .where(DailyTaskStats.day <= end)
+        .group_by(DailyTaskStats.day)
+    ).all()
+    by_day = {day: (created, completed, overdue_delta) for day, created, completed, overdue_delta in rows}
+
+    days = []
+    day = start
+    while day <= end:
+        created, completed, overdue_delta = by_day.get(day, (0, 0, 0))
+        overdue += overdue_delta
+        days.append({"day": day, "created": created, "completed": completed, "overdue": overdue})
+        day += timedelta(days=1)
+    return days
+
+
+def weekly_stats(days: list[dict]) -> list[dict]:
+    """Fold daily stats into weeks starting on Monday (overdue as of the week's last day)."""
+    weeks: dict[date, dict] = {}
+    for item in days:
+        week = item["day"] - timedelta(days=item["day"].weekday())
+        bucket = weeks.setdefault(week, {"day": week, "created": 0, "completed": 0, "overdue": 0})
+        bucket["created"] += item["created"]
+        bucket["completed"] += item["completed"]
+        bucket["overdue"] = item["overdue"]
+    return list(weeks.values())
+
+
+def compact_daily_stats(session: Session, batch_size: Optional[int] = None) -> int:
+    """Merge user-days that have several delta rows into one; returns rows removed.
+
+    Only the rows read are deleted, so deltas appended meanwhile survive for
+    the next pass.
+    """
+    if batch_size is None:
+        batch_size = settings.STATS_COMPACTION_BATCH_SIZE
+    removed = 0
+
+    while True:
+        keys = session.exec(
+            select(DailyTaskStats.user_id, DailyTaskStats.day)
+            .group_by(DailyTaskStats.user_id, DailyTaskStats.day)
+            .having(func.count() > 1)
+            .limit(batch_size)
+        ).all()
+        if not keys:
+            break
+
+        rows = session.exec(
+            select(DailyTaskStats)
+            .where(tuple_(DailyTaskStats.user_id, DailyTaskStats.day).in_([tuple(key) for key in keys]))
+        ).all()
+        merged: dict[tuple, dict] = {}
+        for row in rows:
+            counts = merged.setdefault((row.user_id, row.day), dict.fromkeys(COUNTERS, 0))
+            for counter in COUNTERS:
+                counts[counter] += getattr(row, counter)
+
+        session.execute(delete(DailyTaskStats).where(DailyTaskStats.id.in_([row.id for row in rows])))
+        for (user_id, day), counts in merged.items():
+            if any(counts.values()):
+                session.add(DailyTaskStats(user_id=user_id, day=day, **counts))
+        session.commit()
+        removed += len(rows) - len(merged)
+
+        if len(keys) < batch_size:
+            break
+
+    return removed
+
+
+def rebuild_daily_stats(session: Session, user_id: Optional[str] = None) -> int:
+    """Recompute statistics from hot and archived tasks; returns rows written.
+
+    Completed tasks from before ``completed_at`` existed are counted as
+    completed at their last update. Deleted tasks can't be recovered.
+    """
+    statement = delete(DailyTaskStats)
+    if user_id is not None:
+        statement = statement.where(DailyTaskStats.user_id == user_id)
+    session.execute(statement)
+
+    deltas_by_user: dict[str, dict] = defaultdict(_new_deltas)
+    for model in (Task, ArchivedTask):
+        query = select(
+            model.user_id, model.created_at, model.completed, model.completed_at,
+            model.updated_at, model.due_date
+        )
+        if user_id is not None:
+            query = query.where(model.user_id == user_id)
+        for owner, created_at, completed, completed_at, updated_at, due_date in session.exec(query):
+            if completed and completed_at is None:
+                completed_at = updated_at
+            elif not completed:
+                completed_at = None
+            add_contributions(deltas_by_user[owner], StatsState(created_at, completed_at, due_date))
+
+    written = 0
+    for owner, deltas in deltas_by_user.items():
+        for day, counts in deltas.items():
+            if any(counts.values()):
+                session.add(DailyTaskStats(user_id=owner, day=day, **counts))
+                written += 1
+    session.commit()
+    return written
+
+
+def run_compaction_job() -> int:
+    """Run one compaction pass on every shard."""
+    removed = 0
+    for shard_engine in shard_engines:
+        with Session(shard_engine) as session:
+            removed += compact_daily_stats(session)
+    return removed
+
+
+async def stats_compaction_worker() -> None:
+    """Background loop that periodically compacts daily statistics."""
+    while True:
+        await asyncio.sleep(settings.STATS_COMPACTION_INTERVAL_SECONDS)
+        try:
+            removed = await run_in_threadpool(run_compaction_job)
+            if removed:
+                logger.info("Compacted %d daily statistics rows", removed)
+        except Exception:
+            logger.exception("Statistics compaction failed")
@@ -0,0 +1,140 @@
+"""Hierarchical tasks: materialized paths, subtree queries and roll-ups."""
+from typing import Optional
+from fastapi import HTTPException, status
+from sqlalchemy import delete, func, or_, update
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, select
+from app.config import settings
+from app.models.task import Task, TaskTag
+
+
+def ensure_path(task: Task) -> None:
+    """Give tasks created before hierarchy support their root path."""
+    if not task.path:
+        task.path = f"{task.id}/"
+
+
+def ancestor_ids(task: Task) -> list[str]:
+    """Ids of every ancestor, root first ("a/b/c/" -> ["a", "b"])."""
+    return task.path.split("/")[:-2]
+
+
+def subtree_condition(task: Task):
+    """WHERE clause matching a task and all of its descendants."""
+    return (Task.user_id == task.user_id) & or_(Task.id == task.id, Task.path.startswith(task.path))
+
+
+def adjust_rollups(session: Session, ids: list[str], total_delta: int, completed_delta: int) -> None:
+    """Shift the descendant counters of the given tasks in one UPDATE."""
+    if not ids or (total_delta == 0 and completed_delta == 0):
+        return
+    session.execute(
+        update(Task)
+        .where(Task.id.in_(ids))
+        .values(
+            subtask_count=Task.subtask_count + total_delta,
+            subtask_completed_count=Task.subtask_completed_count + completed_delta
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def attach_to_parent(session: Session, task: Task, parent: Optional[Task]) -> None:
+    """Place a new task under its parent and count it in the ancestors' roll-ups."""
+    if parent is None:
+        task.parent_id, task.depth, task.path = None, 0, f"{task.id}/"
+        return
+
+    ensure_path(parent)
+    if parent.depth + 1 > settings.TASK_MAX_DEPTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Subtasks can be nested at most {settings.TASK_MAX_DEPTH} levels deep"
+        )
+    task.parent_id = parent.id
+    task.depth = parent.depth + 1
+    task.path = f"{parent.path}{task.id}/"
+    adjust_rollups(session, ancestor_ids(task), 1, 1 if task.completed else 0)
+
+
+def completion_changed(session: Session, task: Task) -> None:
+    """Propagate a task's completion flip to its ancestors' roll-ups."""
+    ensure_path(task)
+    adjust_rollups(session, ancestor_ids(task), 0, 1 if task.completed else -1)
+
+
+def subtree_statement(user_id: str, root_id: str):
+    """Select a task and all its descendants with one recursive CTE, depth-first."""
+    tree = (
+        select(Task.id)
+        .where(Task.id == root_id)
+        .where(Task.user_id == user_id)
+        .cte("subtree", recursive=True)
+    )
+    tree = tree.union_all(select(Task.id).where(Task.parent_id == tree.c.id))
+    return (
+        select(Task)
+        .join(tree, Task.id == tree.c.id)
+        .order_by(Task.path)
+        .options(selectinload(Task.tags))
+    )
+
+
+def delete_subtree(session: Session, task: Task) -> int:
+    """Delete a task with all descendants and their tags; returns rows deleted."""
+    ensure_path(task)
+    removed_total = task.subtask_count + 1
+    removed_completed = task.subtask_completed_count + (1 if task.completed else 0)
+    ancestors = ancestor_ids(task)
+    condition = subtree_condition(task)
+
+    session.execute(delete(TaskTag).where(TaskTag.task_id.in_(select(Task.id).where(condition))))
+    result = session.execute(delete(Task).where(condition).execution_options(synchronize_session=False))
+    adjust_rollups(session, ancestors, -removed_total, -removed_completed)
+    return result.rowcount
+
+
+def move_subtree(session: Session, task: Task, parent: Optional[Task]) -> None:
+    """Re-parent a task, rewriting paths and depths of its whole subtree in one UPDATE."""
+    ensure_path(task)
+    if parent is not None:
+        ensure_path(parent)
+        if parent.path.startswith(task.path):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="A task can't be moved under itself or one of its subtasks"
+            )
+
+    new_depth = parent.depth + 1 if parent else 0
+    depth_delta = new_depth - task.depth
+    condition = subtree_condition(task)
+    deepest = session.exec(select(func.max(Task.depth)).where(condition)).one() or task.depth
+    if deepest + depth_delta > settings.TASK_MAX_DEPTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Subtasks can be nested at most {settings.TASK_MAX_DEPTH} levels deep"
+        )
+
+    moved_total = task.subtask_count + 1
+    moved_completed = task.subtask_completed_count + (1 if task.completed else 0)
+    old_prefix = task.path
+    new_prefix = f"{parent.path if parent else ''}{task.id}/"
+
+    adjust_rollups(session, ancestor_ids(task), -moved_total, -moved_completed)
+    session.execute(
+        update(Task)
+        .where(condition)
+        .values(
+            path=new_prefix + func.substr(Task.path, len(old_prefix) + 1),
+            depth=Task.depth + depth_delta
+        )
+        .execution_options(synchronize_session=False)
+    )
+    session.execute(
+        update(Task)
+        .where(Task.id == task.id)
+        .values(parent_id=parent.id if parent else None)
+        .execution_options(synchronize_session=False)
+    )
+    if parent is not None:
+        adjust_rollups(session, ancestor_ids(parent) + [parent.id], moved_total, moved_completed)
@@ -0,0 +1,43 @@
+"""Task tag helpers."""
+from typing import Union
+from sqlalchemy import func
+from sqlmodel import Session, select
+from app.models.task import Task, TaskTag
+
+
+def set_task_tags(task: Task, tags: list[str]) -> None:
+    """Replace a task's tags, keeping rows for tags that stay."""
+    wanted = set(tags)
+    task.tags = [tag for tag in task.tags if tag.tag in wanted]
+    existing = {tag.tag for tag in task.tags}
+    for name in tags:
+        if name not in existing:
+            task.tags.append(TaskTag(tag=name, user_id=task.user_id))
+
+
+def tasks_with_all_tags(user_id: Union[str, list[str]], tags: list[str]):
+    """Subquery of task ids carrying every given tag.
+
+    Answered from the (user_id, tag, task_id) index alone: each tag is an
+    index range scan and GROUP BY/HAVING intersects them. Pass several user
+    ids to include tasks of shared lists (tagged under the list owner).
+    """
+    user_ids = [user_id] if isinstance(user_id, str) else user_id
+    return (
+        select(TaskTag.task_id)
+        .where(TaskTag.user_id.in_(user_ids))
+        .where(TaskTag.tag.in_(tags))
+        .group_by(TaskTag.task_id)
+        .having(func.count() == len(tags))
+    )
+
+
+def tag_counts(session: Session, user_id: str) -> list[tuple[str, int]]:
+    """Number of tasks per tag for a user, most used first."""
+    statement = (
+        select(TaskTag.tag, func.count().label("count"))
+        .where(TaskTag.user_id == user_id)
+        .group_by(TaskTag.tag)
+        .order_by(func.count().desc(), TaskTag.tag)
+    )
+    return list(session.exec(statement).all())
@@ -1,41 +1,270 @@
 """Database connection and session management."""
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from fastapi.concurrency import run_in_threadpool
+from typing import Optional
+from sqlalchemy import exc as sa_exc, inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
 from sqlmodel import create_engine, Session, SQLModel
 from app.config import settings
-from urllib.parse import urlparse
 
 
-def get_engine():
+logger = logging.getLogger(__name__)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records checkout wait times and timeouts."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except sa_exc.TimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            with self._stats_lock:
+                self.checkouts += 1
+                self.wait_total += waited
+                self.wait_max = max(self.wait_max, waited)
+
+
+def _pool_kwargs() -> dict:
+    """Pool settings shared by every pooled engine."""
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
+
+def get_engine(url: Optional[str] = None):
     """Create database engine based on database type."""
-    url = settings.DATABASE_URL
+    url = url or settings.DATABASE_URL
 
     if url.startswith("sqlite:///"):
-        # SQLite configuration
+        # SQLite configuration; in-memory databases keep SQLAlchemy's default pool
+        kwargs = {} if ":memory:" in url else _pool_kwargs()
         return create_engine(
-            settings.DATABASE_URL,
+            url,
             echo=settings.DEBUG,
-            connect_args={"check_same_thread": False}
+            connect_args={"check_same_thread": False},
+            **kwargs
         )
     else:
         # PostgreSQL configuration with connection pooling
         return create_engine(
-            settings.DATABASE_URL,
+            url,
             echo=settings.DEBUG,
-            pool_pre_ping=True,
-            pool_size=10,
-            max_overflow=20
+            **_pool_kwargs()
         )
 
 
-# Create database engine
+# Create database engine (primary database: user directory, revoked tokens)
 engine = get_engine()
 
+# Shard engines holding user data; without a shard map the primary is the only shard
+shard_engines: list[Engine] = [
+    engine if url == settings.DATABASE_URL else get_engine(url)
+    for url in settings.SHARD_DATABASE_URLS
+] or [engine]
+
+
+def is_sharded() -> bool:
+    """Whether user data is spread over SHARD_DATABASE_URLS."""
+    return bool(settings.SHARD_DATABASE_URLS)
+
+
+def all_engines() -> list[Engine]:
+    """The primary engine followed by every distinct shard engine."""
+    engines = [engine]
+    for shard_engine in shard_engines:
+        if shard_engine is not engine:
+            engines.append(shard_engine)
+    return engines
+
+
+def shard_for_user(user_id: str, shard_count: Optional[int] = None) -> int:
+    """Stable shard index for a user id (independent of PYTHONHASHSEED)."""
+    digest = hashlib.sha1(user_id.encode()).digest()
+    return int.from_bytes(digest[:8], "big") % (shard_count or len(shard_engines))
+
+
+def engine_for_user(user_id: str) -> Engine:
+    """Engine of the shard holding a user's data."""
+    return shard_engines[shard_for_user(user_id)]
+
 
 def get_session():
-    """Dependency for database session."""
+    """Dependency for a primary database session (auth, directory)."""
     with Session(engine) as session:
         yield session
 
 
+def _column_default(column, dialect) -> str:
+    """SQL for a column's server default."""
+    default = column.server_default.arg
+    if isinstance(default, str):
+        return "'" + default.replace("'", "''") + "'"
+    return str(default.compile(dialect=dialect))
+
+
+def add_missing_columns(db_engine) -> list[str]:
+    """Add columns that models gained after their table was created.
+
+    ``create_all`` only creates missing tables; this covers additive column
+    changes: nullable columns, and NOT NULL columns with a ``server_default``.
+    A column's ``info["backfill"]`` SQL expression, if any, then fills
+    existing rows in the same transaction. Any other missing column raises
+    ``RuntimeError``. Returns the columns added, as "table.column".
+    """
+    inspector = inspect(db_engine)
+    existing_tables = set(inspector.get_table_names())
+    missing = []
+    for table in SQLModel.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        present = {column["name"] for column in inspector.get_columns(table.name)}
+        missing.extend(column for column in table.columns if column.name not in present)
+
+    unsupported = [
+        f"{column.table.name}.{column.name}"
+        for column in missing
+        if not column.nullable and column.server_default is None
+    ]
+    if unsupported:
+        raise RuntimeError(
+            "Cannot add NOT NULL columns without a server default to existing tables: "
+            + ", ".join(unsupported)
+        )
+
+    with db_engine.begin() as connection:
+        for column in missing:
+            table_name = column.table.name
+            definition = f"{column.name} {column.type.compile(dialect=db_engine.dialect)}"
+            if column.server_default is not None:
+                definition += f" DEFAULT {_column_default(column, db_engine.dialect)}"
+            if not column.nullable:
+                definition += " NOT NULL"
+            connection.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {definition}"))
+            if "backfill" in column.info:
+                connection.execute(text(f"UPDATE {table_name} SET {column.name} = {column.info['backfill']}"))
+    return [f"{column.table.name}.{column.name}" for column in missing]
+
+
+def add_missing_indexes(db_engine) -> None:
+    """Create indexes that models gained after their table was created."""
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(db_engine, checkfirst=True)
+
+
 def create_db_and_tables():
-    """Create all database tables."""
-    SQLModel.metadata.create_all(engine)
+    """Create all database tables (and newly added columns and indexes) on the primary and every shard."""
+    for db_engine in all_engines():
+        SQLModel.metadata.create_all(db_engine)
+        add_missing_columns(db_engine)
+        add_missing_indexes(db_engine)
+
+
+def ping_database(db_engine=None) -> None:
+    """Run a trivial query to confirm the database is reachable."""
+    with (db_engine or engine).connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+
+def pool_status(db_engine=None) -> dict:
+    """Live connection pool statistics for an engine."""
+    pool = (db_engine or engine).pool
+    if not isinstance(pool, QueuePool):
+        return {"pooled": False}
+
+    capacity = pool.size() + max(pool._max_overflow, 0)
+    status = {
+        "pooled": True,
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "saturation": round(pool.checkedout() / capacity, 3) if capacity else 0.0,
+    }
+    if isinstance(pool, InstrumentedQueuePool):
+        status.update({
+            "checkouts": pool.checkouts,
+            "timeouts": pool.timeouts,
+            "wait_avg_ms": round(pool.wait_total / pool.checkouts * 1000, 3) if pool.checkouts else 0.0,
+            "wait_max_ms": round(pool.wait_max * 1000, 3),
+        })
+    return status
+
+
+def warm_up_pool(db_engine=None) -> int:
+    """Open pool connections up front so the first requests don't pay for it."""
+    db_engine = db_engine or engine
+    pool = db_engine.pool
+    if not isinstance(pool, QueuePool):
+        return 0
+
+    target = min(settings.DB_POOL_WARMUP_CONNECTIONS, pool.size())
+    connections = []
+    try:
+        # Hold them all at once so each checkout opens a distinct connection
+        for _ in range(target):
+            connections.append(db_engine.connect())
+    finally:
+        for connection in connections:
+            connection.close()
+    return len(connections)
+
+
+def check_idle_connections(db_engine=None) -> int:
+    """Ping each idle pooled connection once, discarding dead ones.
+
+    The pool hands out connections in FIFO order and a returned connection
+    goes to the back of the queue, so checking out ``checkedin()`` connections
+    one at a time visits every idle connection without hoarding the pool.
+    """
+    db_engine = db_engine or engine
+    pool = db_engine.pool
+    if not isinstance(pool, QueuePool):
+        return 0
+
+    checked = 0
+    for _ in range(pool.checkedin()):
+        with db_engine.connect() as connection:
+            try:
+                connection.execute(text("SELECT 1"))
+            except sa_exc.DBAPIError as exc:
+                if not exc.connection_invalidated:
+                    connection.invalidate()
+            checked += 1
+    return checked
+
+
+async def pool_liveness_worker() -> None:
+    """Background loop replacing per-checkout pre-ping for idle connections."""
+    while True:
+        await asyncio.sleep(settings.DB_POOL_LIVENESS_INTERVAL_SECONDS)
+        try:
+            for db_engine in all_engines():
+                await run_in_threadpool(check_idle_connections, db_engine)
+        except Exception:
+            logger.exception("Connection pool liveness check failed")
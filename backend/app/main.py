@@ -1,16 +1,41 @@
 """FastAPI application initialization."""
-from fastapi import FastAPI, Request
+import asyncio
+from fastapi import FastAPI, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import HTTPException, RequestValidationError
 from datetime import datetime
 from app.config import settings
-from app.database import create_db_and_tables
+from app.database import (
+    create_db_and_tables, warm_up_pool, pool_status, pool_liveness_worker, ping_database,
+    all_engines
+)
 from app.api.tasks import router as tasks_router
+from app.api.archive import router as archive_router
+from app.api.series import router as series_router
+from app.api.activity import router as activity_router
+from app.api.analytics import router as analytics_router
+from app.api.lists import router as lists_router
+from app.api.admin import router as admin_router
+from app.core.activity import activity_log
+from app.core.access_log import AccessLogMiddleware, access_log
+from app.core.coalesce import read_coalescer
+from app.core.sharing import membership_cache, membership_sync_worker
+from app.core.archive import archive_worker
+from app.core.stats import stats_compaction_worker
+from app.core.idempotency import idempotency_purge_worker, idempotency_store
+from app.core.revocation import denylist_worker
 from app.api.auth import router as auth_router
 # Import models to register them with SQLModel metadata
-from app.models.user import User
-from app.models.task import Task
+from app.models.user import User, UserDirectory
+from app.models.task import Task, ArchivedTask
+from app.models.token import RevokedToken
+from app.models.series import TaskSeries
+from app.models.activity import TaskActivity
+from app.models.stats import DailyTaskStats
+from app.models.task_list import TaskList, ListMember
+from app.models.idempotency import IdempotencyKey
 
 
 # Create FastAPI app
@@ -30,17 +55,53 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Access log (outermost, so it times everything else)
+app.add_middleware(AccessLogMiddleware)
+
 
-# Include routers
+# Include routers (archive before tasks so /archived isn't taken as a task id)
 app.include_router(auth_router)
+app.include_router(archive_router)
+app.include_router(series_router)
+app.include_router(activity_router)
+app.include_router(analytics_router)
+app.include_router(lists_router)
+app.include_router(admin_router)
 app.include_router(tasks_router)
 
 
+# Long-running background jobs, cancelled on shutdown
+background_tasks: list[asyncio.Task] = []
+
+
 # Startup event - create tables
 @app.on_event("startup")
 async def on_startup():
-    """Create database tables on startup."""
+    """Create database tables, warm the pool and start background jobs on startup."""
     create_db_and_tables()
+    for db_engine in all_engines():
+        await run_in_threadpool(warm_up_pool, db_engine)
+    background_tasks.append(asyncio.create_task(pool_liveness_worker()))
+    activity_log.start()
+    access_log.start()
+    background_tasks.append(asyncio.create_task(denylist_worker()))
+    background_tasks.append(asyncio.create_task(membership_sync_worker()))
+    if settings.ARCHIVE_ENABLED:
+        background_tasks.append(asyncio.create_task(archive_worker()))
+    background_tasks.append(asyncio.create_task(stats_compaction_worker()))
+    background_tasks.append(asyncio.create_task(idempotency_purge_worker()))
+
+
+# Shutdown event - stop background jobs
+@app.on_event("shutdown")
+async def on_shutdown():
+    """Cancel background jobs and drain the activity and access logs on shutdown."""
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    background_tasks.clear()
+    await run_in_threadpool(activity_log.stop)
+    await run_in_threadpool(access_log.stop)
 
 
 # Health check endpoint
@@ -53,6 +114,43 @@ async def health_check():
     }
 
 
+# Readiness endpoint
+@app.get("/ready")
+async def readiness_check():
+    """Readiness endpoint reporting connection pool saturation."""
+    engines = all_engines()
+    pools = [pool_status(db_engine) for db_engine in engines]
+    ready = all(
+        pool.get("saturation", 0.0) < settings.DB_POOL_READY_MAX_SATURATION
+        for pool in pools
+    )
+
+    if ready:
+        try:
+            for db_engine in engines:
+                await run_in_threadpool(ping_database, db_engine)
+        except Exception:
+            ready = False
+
+    content = {
+        "status": "ready" if ready else "unavailable",
+        "timestamp": datetime.utcnow().isoformat(),
+        "pool": pools[0]
+    }
+    if len(pools) > 1:
+        content["shard_pools"] = pools[1:]
+    content["activity_log"] = activity_log.stats
+    content["read_coalescing"] = read_coalescer.stats
+    content["membership_cache"] = membership_cache.stats
+    content["idempotency"] = idempotency_store.stats
+    content["access_log"] = access_log.stats
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content=content
+    )
+
+
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -1 +1,18 @@
 # Database models
+#
+# Every model module is imported here so that importing any model registers
+# the full schema with SQLModel.metadata; create_all, shard moves and
+# backups all walk the metadata and would silently skip unimported tables.
+from app.models.user import User, UserDirectory
+from app.models.series import TaskSeries
+from app.models.task import Task, TaskTag, ArchivedTask
+from app.models.token import RevokedToken
+from app.models.activity import TaskActivity
+from app.models.stats import DailyTaskStats
+from app.models.task_list import TaskList, ListMember, MembershipChange
+from app.models.idempotency import IdempotencyKey
+
+__all__ = [
+    "User", "UserDirectory", "TaskSeries", "Task", "TaskTag", "ArchivedTask", "RevokedToken",
+    "TaskActivity", "DailyTaskStats", "TaskList", "ListMember", "MembershipChange", "IdempotencyKey",
+]
@@ -0,0 +1,28 @@
+"""Task activity log model."""
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Column, Index, JSON
+from datetime import datetime
+from typing import Optional
+from uuid import uuid4
+
+
+class TaskActivity(SQLModel, table=True):
+    """One change to a task, with field-level before/after values."""
+    __tablename__ = "task_activity"
+    __table_args__ = (
+        Index("ix_task_activity_task_created", "task_id", "created_at"),
+        Index("ix_task_activity_user_created", "user_id", "created_at"),
+    )
+
+    id: str = Field(default_factory=lambda: str(uuid4()), primary_key=True)
+    # No foreign key: history outlives deleted tasks
+    task_id: str
+    # The task's owner: entries live on the owner's shard, next to the task
+    user_id: str
+    # Who made the change (an editor on a shared list); null on entries
+    # written before lists could be shared, which were all the owner's
+    actor_id: Optional[str] = None
+    action: str
+    # {"field": [old, new], ...}
+    changes: Optional[dict] = Field(default=None, sa_column=Column(JSON))
+    created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -0,0 +1,24 @@
+"""Idempotency key model."""
+from typing import Optional
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Column, LargeBinary
+from datetime import datetime
+
+
+class IdempotencyKey(SQLModel, table=True):
+    """The stored response of a write sent with an Idempotency-Key header.
+
+    Lives on the user's shard. ``status_code`` is null while the first
+    request is still running, which makes the row a claim other workers wait
+    on; expired rows are purged in the background.
+    """
+    __tablename__ = "idempotency_keys"
+
+    user_id: str = Field(primary_key=True)
+    key: str = Field(primary_key=True, max_length=255)
+    # SHA-256 of the operation and its request body
+    fingerprint: str = Field(max_length=64)
+    status_code: Optional[int] = None
+    body: Optional[bytes] = Field(default=None, sa_column=Column(LargeBinary))
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: datetime = Field(index=True)
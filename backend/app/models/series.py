@@ -0,0 +1,36 @@
+"""Recurring task series model."""
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Column, JSON
+from datetime import datetime
+from typing import Optional
+from uuid import uuid4
+
+
+class TaskSeries(SQLModel, table=True):
+    """Recurrence rule stored once; occurrences are expanded on demand.
+
+    Only occurrences a user completes or edits become rows in ``tasks``
+    (linked back through ``series_id``/``occurrence_at``).
+    """
+    __tablename__ = "task_series"
+
+    id: str = Field(default_factory=lambda: str(uuid4()), primary_key=True)
+    title: str = Field(min_length=1, max_length=200)
+    description: Optional[str] = Field(default=None, max_length=1000)
+    priority: str = Field(default="medium")
+    tags: Optional[list[str]] = Field(default=None, sa_column=Column(JSON))
+
+    # Rule: every `interval` days/weeks/months from `starts_at`, bounded by
+    # `until` and/or `count` occurrences
+    frequency: str = Field(default="daily")
+    interval: int = Field(default=1)
+    starts_at: datetime
+    until: Optional[datetime] = None
+    count: Optional[int] = None
+    # ISO timestamps of occurrences the user deleted
+    skipped: Optional[list[str]] = Field(default=None, sa_column=Column(JSON))
+
+    user_id: str = Field(foreign_key="users.id", index=True)
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
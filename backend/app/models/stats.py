@@ -0,0 +1,26 @@
+"""Daily task statistics model."""
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Index
+from datetime import date
+from uuid import uuid4
+
+
+class DailyTaskStats(SQLModel, table=True):
+    """Per-user, per-day counter deltas behind the analytics endpoint.
+
+    Writes append a row instead of updating a shared one, so concurrent
+    requests never contend; the compaction job later merges the rows of each
+    (user_id, day) into one.
+    """
+    __tablename__ = "task_daily_stats"
+    __table_args__ = (
+        Index("ix_task_daily_stats_user_day", "user_id", "day"),
+    )
+
+    id: str = Field(default_factory=lambda: str(uuid4()), primary_key=True)
+    user_id: str
+    day: date
+    created: int = Field(default=0)
+    completed: int = Field(default=0)
+    # Change in the number of overdue open tasks at the end of this day
+    overdue_delta: int = Field(default=0)
@@ -1,23 +1,93 @@
 """Task model."""
-from sqlmodel import SQLModel, Field
+from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Column, Index, JSON
 from datetime import datetime
 from typing import Optional
 from uuid import uuid4
+# Registers task_series so the series_id foreign key resolves wherever Task is used
+from app.models.series import TaskSeries  # noqa: F401
 
 
-class Task(SQLModel, table=True):
-    """Task model with user ownership."""
-    __tablename__ = "tasks"
-
+class TaskBase(SQLModel):
+    """Columns shared by hot and archived tasks."""
     id: str = Field(default_factory=lambda: str(uuid4()), primary_key=True)
     title: str = Field(min_length=1, max_length=200)
     description: Optional[str] = Field(default=None, max_length=1000)
     completed: bool = Field(default=False)
+    completed_at: Optional[datetime] = None
     priority: str = Field(default="medium")
     due_date: Optional[datetime] = None
 
     # Foreign key to user
     user_id: str = Field(foreign_key="users.id", index=True)
 
+    # Shared list the task belongs to (no foreign key: lists live on the
+    # primary database, tasks on their owner's shard)
+    list_id: Optional[str] = Field(default=None, index=True)
+
+    # Set on materialized occurrences of a recurring series
+    series_id: Optional[str] = Field(default=None, foreign_key="task_series.id")
+    occurrence_at: Optional[datetime] = None
+
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class Task(TaskBase, table=True):
+    """Task model with user ownership (hot set)."""
+    __tablename__ = "tasks"
+    __table_args__ = (
+        # Lets the archive job find old completed tasks without a full scan
+        Index("ix_tasks_completed_completed_at", "completed", "completed_at"),
+        # Subtree moves and deletes select descendants by path prefix
+        Index("ix_tasks_user_id_path", "user_id", "path"),
+        # One row per materialized occurrence; also the lookup for overlaying them
+        Index("ix_tasks_series_occurrence", "series_id", "occurrence_at", unique=True),
+        # Due-date window queries
+        Index("ix_tasks_user_id_due_date", "user_id", "due_date"),
+    )
+
+    # Hierarchy: path is the "/"-terminated chain of ancestor ids ending with
+    # this task's own id, e.g. "root/child/grandchild/". Server defaults let
+    # these columns be added to tables created before hierarchy support;
+    # existing rows become roots.
+    parent_id: Optional[str] = Field(default=None, foreign_key="tasks.id", index=True)
+    depth: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    path: str = Field(
+        default="",
+        sa_column_kwargs={"server_default": "", "info": {"backfill": "id || '/'"}}
+    )
+
+    # Completion roll-up over all descendants, maintained incrementally
+    subtask_count: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    subtask_completed_count: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+
+    # Never lazy-loaded in lists: the list endpoint batches them with selectinload
+    tags: list["TaskTag"] = Relationship(
+        sa_relationship_kwargs={"cascade": "all, delete-orphan", "order_by": "TaskTag.tag"}
+    )
+
+
+class ArchivedTask(TaskBase, table=True):
+    """Completed task moved out of the hot table by the archive job."""
+    __tablename__ = "archived_tasks"
+    __table_args__ = (
+        Index("ix_archived_tasks_series_occurrence", "series_id", "occurrence_at"),
+    )
+
+    archived_at: datetime = Field(default_factory=datetime.utcnow)
+    # Tag names carried along so a restore can recreate the task_tags rows
+    tags: Optional[list[str]] = Field(default=None, sa_column=Column(JSON))
+
+
+class TaskTag(SQLModel, table=True):
+    """Tag attached to a task (many-to-many by tag name)."""
+    __tablename__ = "task_tags"
+    __table_args__ = (
+        # Covering index: "tasks with tag X and Y" is an index-only intersection
+        Index("ix_task_tags_user_tag_task", "user_id", "tag", "task_id"),
+    )
+
+    task_id: str = Field(foreign_key="tasks.id", primary_key=True)
+    tag: str = Field(primary_key=True, max_length=50)
+    user_id: str = Field(foreign_key="users.id")
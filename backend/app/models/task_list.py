@@ -0,0 +1,44 @@
+"""Shared task list models."""
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Index
+from datetime import datetime
+from uuid import uuid4
+
+
+class TaskList(SQLModel, table=True):
+    """A named list of tasks that its owner can share with other users.
+
+    Lists and memberships live on the primary database; the list's tasks stay
+    on the owner's shard with ``user_id`` set to the owner.
+    """
+    __tablename__ = "task_lists"
+
+    id: str = Field(default_factory=lambda: str(uuid4()), primary_key=True)
+    name: str = Field(min_length=1, max_length=100)
+    owner_id: str = Field(index=True)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class ListMember(SQLModel, table=True):
+    """A user's role on a list ("owner", "editor" or "viewer")."""
+    __tablename__ = "list_members"
+    __table_args__ = (
+        # "My lists": every membership of a user, with the role, from the index alone
+        Index("ix_list_members_user_list_role", "user_id", "list_id", "role"),
+    )
+
+    # Primary key (list_id, user_id) serves "who can access this list"
+    list_id: str = Field(foreign_key="task_lists.id", primary_key=True)
+    user_id: str = Field(primary_key=True)
+    role: str = Field(default="viewer")
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class MembershipChange(SQLModel, table=True):
+    """A user whose memberships changed, so other workers drop their cached copy."""
+    __tablename__ = "membership_changes"
+
+    id: str = Field(default_factory=lambda: str(uuid4()), primary_key=True)
+    user_id: str
+    changed_at: datetime = Field(default_factory=datetime.utcnow, index=True)
@@ -0,0 +1,13 @@
+"""Revoked token model."""
+from sqlmodel import SQLModel, Field
+from datetime import datetime
+
+
+class RevokedToken(SQLModel, table=True):
+    """Denylist entry for a revoked JWT, kept until the token expires."""
+    __tablename__ = "revoked_tokens"
+
+    jti: str = Field(primary_key=True)
+    user_id: str = Field(index=True)
+    expires_at: datetime = Field(index=True)
+    revoked_at: datetime = Field(default_factory=datetime.utcnow, index=True)
@@ -15,3 +15,12 @@ class User(SQLModel, table=True):
     hashed_password: str = Field()
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class UserDirectory(SQLModel, table=True):
+    """Email to user id lookup kept on the primary database when sharded."""
+    __tablename__ = "user_directory"
+
+    email: str = Field(primary_key=True)
+    user_id: str = Field(unique=True, index=True)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
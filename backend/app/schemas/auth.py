@@ -33,3 +33,13 @@ class AuthResponse(BaseModel):
     success: bool = True
     data: dict
     message: str = "Authentication successful"
+
+
+class RefreshRequest(BaseModel):
+    """Schema for exchanging a refresh token."""
+    refresh_token: str
+
+
+class LogoutRequest(BaseModel):
+    """Schema for logout; the refresh token is revoked too when given."""
+    refresh_token: Optional[str] = None
@@ -0,0 +1,25 @@
+"""Backup schemas."""
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+
+class BackupFileResponse(BaseModel):
+    """Schema for one database's backup file and its progress."""
+    path: str
+    dialect: str
+    unit: str
+    done: int
+    total: int
+    restarts: int = 0
+    bytes: Optional[int] = None
+
+
+class BackupJobResponse(BaseModel):
+    """Schema for a backup run."""
+    id: str
+    status: str
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    files: list[BackupFileResponse]
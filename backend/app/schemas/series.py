@@ -0,0 +1,72 @@
+"""Recurring task series schemas."""
+from pydantic import BaseModel, Field, field_validator
+from pydantic_core import PydanticCustomError
+from datetime import datetime
+from typing import Literal, Optional
+from app.schemas.task import MAX_TAGS_PER_TASK, TagName, normalize_tags
+
+
+Frequency = Literal["daily", "weekly", "monthly"]
+
+
+class SeriesCreate(BaseModel):
+    """Schema for creating a recurring series."""
+    title: str = Field(min_length=1, max_length=200)
+    description: Optional[str] = Field(None, max_length=1000)
+    priority: str = Field(default="medium")
+    tags: list[TagName] = Field(default_factory=list, max_length=MAX_TAGS_PER_TASK)
+    frequency: Frequency = "daily"
+    interval: int = Field(default=1, ge=1, le=366)
+    starts_at: datetime
+    until: Optional[datetime] = None
+    count: Optional[int] = Field(None, ge=1)
+
+    @field_validator("tags")
+    @classmethod
+    def _normalize_tags(cls, value: list[str]) -> list[str]:
+        return normalize_tags(value)
+
+
+class SeriesUpdate(BaseModel):
+    """Schema for updating a series; applies to occurrences not yet materialized."""
+    title: Optional[str] = Field(None, min_length=1, max_length=200)
+    description: Optional[str] = Field(None, max_length=1000)
+    priority: Optional[str] = None
+    tags: Optional[list[TagName]] = Field(None, max_length=MAX_TAGS_PER_TASK)
+    frequency: Optional[Frequency] = None
+    interval: Optional[int] = Field(None, ge=1, le=366)
+    starts_at: Optional[datetime] = None
+    until: Optional[datetime] = None
+    count: Optional[int] = Field(None, ge=1)
+
+    @field_validator("tags")
+    @classmethod
+    def _normalize_tags(cls, value: Optional[list[str]]) -> Optional[list[str]]:
+        return normalize_tags(value)
+
+    @field_validator("title", "priority", "frequency", "interval", "starts_at")
+    @classmethod
+    def _not_null(cls, value):
+        # These may be omitted but not cleared; the columns are NOT NULL
+        if value is None:
+            raise PydanticCustomError("not_null", "Field may not be null")
+        return value
+
+
+class SeriesResponse(BaseModel):
+    """Schema for series response."""
+    id: str
+    title: str
+    description: Optional[str]
+    priority: str
+    tags: Optional[list[str]]
+    frequency: str
+    interval: int
+    starts_at: datetime
+    until: Optional[datetime]
+    count: Optional[int]
+    user_id: str
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = {"from_attributes": True}
@@ -1,7 +1,25 @@
 """Task schemas for request/response validation."""
-from pydantic import BaseModel, Field
-from datetime import datetime
-from typing import Optional
+from pydantic import BaseModel, Field, field_validator
+from datetime import date, datetime
+from typing import Annotated, Any, Optional
+
+
+MAX_TAGS_PER_TASK = 20
+MAX_TAG_LENGTH = 50
+
+TagName = Annotated[str, Field(min_length=1, max_length=MAX_TAG_LENGTH)]
+
+
+def normalize_tags(tags: Optional[list[str]]) -> Optional[list[str]]:
+    """Lowercase, strip and de-duplicate tag names, keeping their order."""
+    if tags is None:
+        return None
+    normalized = []
+    for tag in tags:
+        tag = tag.strip().lower()
+        if tag and tag not in normalized:
+            normalized.append(tag)
+    return normalized
 
 
 class TaskCreate(BaseModel):
@@ -10,6 +28,15 @@ class TaskCreate(BaseModel):
     description: Optional[str] = Field(None, max_length=1000)
     priority: str = Field(default="medium")
     due_date: Optional[datetime] = None
+    tags: list[TagName] = Field(default_factory=list, max_length=MAX_TAGS_PER_TASK)
+    parent_id: Optional[str] = None
+    # Shared list to create the task in (subtasks always join their parent's list)
+    list_id: Optional[str] = None
+
+    @field_validator("tags")
+    @classmethod
+    def _normalize_tags(cls, value: list[str]) -> list[str]:
+        return normalize_tags(value)
 
 
 class TaskUpdate(BaseModel):
@@ -19,6 +46,14 @@ class TaskUpdate(BaseModel):
     completed: Optional[bool] = None
     priority: Optional[str] = None
     due_date: Optional[datetime] = None
+    tags: Optional[list[TagName]] = Field(None, max_length=MAX_TAGS_PER_TASK)
+    # Move a top-level task with its subtasks into one of the owner's lists (null: out of any list)
+    list_id: Optional[str] = None
+
+    @field_validator("tags")
+    @classmethod
+    def _normalize_tags(cls, value: Optional[list[str]]) -> Optional[list[str]]:
+        return normalize_tags(value)
 
 
 class TaskResponse(BaseModel):
@@ -27,10 +62,67 @@ class TaskResponse(BaseModel):
     title: str
     description: Optional[str]
     completed: bool
+    completed_at: Optional[datetime] = None
     priority: str
     due_date: Optional[datetime]
     user_id: str
     created_at: datetime
     updated_at: datetime
+    tags: list[str] = []
+    parent_id: Optional[str] = None
+    list_id: Optional[str] = None
+    depth: int = 0
+    subtask_count: int = 0
+    subtask_completed_count: int = 0
+    series_id: Optional[str] = None
+    occurrence_at: Optional[datetime] = None
+    # True for recurring occurrences that exist only on the series so far
+    virtual: bool = False
 
     model_config = {"from_attributes": True}
+
+    @field_validator("tags", mode="before")
+    @classmethod
+    def _tag_names(cls, value: Any) -> list[str]:
+        """Accept TaskTag rows as well as plain tag names."""
+        if not value:
+            return []
+        return [getattr(tag, "tag", tag) for tag in value]
+
+
+class TaskMove(BaseModel):
+    """Schema for moving a task (and its subtree) under a new parent."""
+    parent_id: Optional[str] = None
+
+
+class TagCount(BaseModel):
+    """Schema for a tag with the number of tasks using it."""
+    tag: str
+    count: int
+
+
+class ArchivedTaskResponse(TaskResponse):
+    """Schema for archived task response."""
+    archived_at: datetime
+
+
+class ActivityResponse(BaseModel):
+    """Schema for a task activity entry."""
+    id: str
+    task_id: str
+    user_id: str
+    actor_id: Optional[str] = None
+    action: str
+    changes: Optional[dict]
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class DailyStatsResponse(BaseModel):
+    """Schema for task statistics of one day (or week, starting that day)."""
+    day: date
+    created: int
+    completed: int
+    # Open tasks past their due day at the end of the period
+    overdue: int
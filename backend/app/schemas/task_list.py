@@ -0,0 +1,47 @@
+"""Shared task list schemas."""
+from pydantic import BaseModel, EmailStr, Field
+from datetime import datetime
+from typing import Literal
+
+
+MemberRole = Literal["viewer", "editor"]
+
+
+class ListCreate(BaseModel):
+    """Schema for creating a list."""
+    name: str = Field(min_length=1, max_length=100)
+
+
+class ListUpdate(BaseModel):
+    """Schema for renaming a list."""
+    name: str = Field(min_length=1, max_length=100)
+
+
+class MemberUpsert(BaseModel):
+    """Schema for sharing a list with a user, or changing their role."""
+    email: EmailStr
+    role: MemberRole = "viewer"
+
+
+class MemberResponse(BaseModel):
+    """Schema for a list member."""
+    user_id: str
+    role: str
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class ListResponse(BaseModel):
+    """Schema for a list with the caller's role on it."""
+    id: str
+    name: str
+    owner_id: str
+    role: str
+    created_at: datetime
+    updated_at: datetime
+
+
+class ListDetailResponse(ListResponse):
+    """Schema for a list with its members."""
+    members: list[MemberResponse]
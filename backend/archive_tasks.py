@@ -0,0 +1,25 @@
+"""Script to archive completed tasks out of the hot tasks table."""
+import argparse
+from sqlmodel import Session
+from app.config import settings
+from app.database import shard_engines, create_db_and_tables
+from app.models.user import User
+from app.models.task import Task, ArchivedTask
+from app.core.archive import archive_completed_tasks
+
+
+parser = argparse.ArgumentParser(description=__doc__)
+parser.add_argument("--days", type=int, default=settings.ARCHIVE_AFTER_DAYS,
+                    help="archive tasks completed more than this many days ago")
+parser.add_argument("--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE)
+args = parser.parse_args()
+
+# Make sure the archive table exists
+create_db_and_tables()
+
+moved = 0
+for shard_engine in shard_engines:
+    with Session(shard_engine) as session:
+        moved += archive_completed_tasks(session, args.days, args.batch_size)
+
+print(f"Archived {moved} tasks completed more than {args.days} days ago")
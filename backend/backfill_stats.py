@@ -0,0 +1,47 @@
+"""Script to backfill completion times and rebuild daily task statistics."""
+import argparse
+from sqlalchemy import inspect, text, update
+from sqlmodel import Session
+from app.database import shard_engines, create_db_and_tables
+from app.models.user import User
+from app.models.task import Task, ArchivedTask
+from app.models.stats import DailyTaskStats
+from app.core.stats import rebuild_daily_stats
+
+
+parser = argparse.ArgumentParser(description=__doc__)
+parser.add_argument("--user-id", help="only rebuild this user's statistics")
+args = parser.parse_args()
+
+# Make sure the statistics table exists
+create_db_and_tables()
+
+written = 0
+for shard_engine in shard_engines:
+    # Tables created before completed_at existed don't get the column from create_all
+    columns = {
+        table: {column["name"] for column in inspect(shard_engine).get_columns(table)}
+        for table in (Task.__tablename__, ArchivedTask.__tablename__)
+    }
+    with shard_engine.begin() as connection:
+        for table, names in columns.items():
+            if "completed_at" not in names:
+                connection.execute(text(f"ALTER TABLE {table} ADD COLUMN completed_at TIMESTAMP"))
+                print(f"Added completed_at to {table} on {shard_engine.url!r}")
+
+    with Session(shard_engine) as session:
+        # Best available estimate for tasks completed before completion times were recorded
+        for model in (Task, ArchivedTask):
+            statement = (
+                update(model)
+                .where(model.completed == True)  # noqa: E712
+                .where(model.completed_at == None)  # noqa: E711
+                .values(completed_at=model.updated_at)
+            )
+            if args.user_id:
+                statement = statement.where(model.user_id == args.user_id)
+            session.execute(statement)
+        session.commit()
+        written += rebuild_daily_stats(session, args.user_id)
+
+print(f"Rebuilt daily task statistics ({written} rows)")
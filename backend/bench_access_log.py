@@ -0,0 +1,132 @@
+"""Benchmark the latency the access log adds to a request.
+
+Drives a minimal FastAPI app directly over ASGI (no network) and compares
+per-request latency without logging, with the queued access log, and with
+naive synchronous JSON logging. The sink sleeps on every write to stand in
+for a slow or back-pressured stdout:
+
+    python bench_access_log.py --requests 20000 --sink-delay-ms 1
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+
+os.environ.setdefault("BETTER_AUTH_SECRET", "bench")
+os.environ.setdefault("BETTER_AUTH_URL", "http://localhost:3000")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+from fastapi import FastAPI
+from app.config import settings
+from app.core.access_log import AccessLog, AccessLogMiddleware
+
+
+class SlowSink:
+    """Write target that takes a fixed time per write call."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.lines = 0
+
+    def write(self, text: str) -> None:
+        time.sleep(self.delay)
+        self.lines += text.count("\n")
+
+    def flush(self) -> None:
+        pass
+
+
+class SyncLogMiddleware:
+    """What inline logging costs: serialize and write in the request."""
+
+    def __init__(self, app, sink: SlowSink):
+        self.app = app
+        self.sink = sink
+
+    async def __call__(self, scope, receive, send):
+        started = time.perf_counter()
+        await self.app(scope, receive, send)
+        entry = {"method": scope["method"], "path": scope["path"],
+                 "duration_ms": (time.perf_counter() - started) * 1000}
+        self.sink.write(json.dumps(entry) + "\n")
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"status": "ok"}
+
+    return app
+
+
+async def drive(asgi_app, requests: int) -> list[float]:
+    """Per-request latencies (ms) of sequential GET /ping calls."""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/ping", "raw_path": b"/ping", "query_string": b"",
+        "root_path": "", "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1),
+        "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    timings = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        await asgi_app(dict(scope), receive, send)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def summarize(label: str, timings: list[float], baseline_p99: float = None) -> float:
+    timings = sorted(timings)
+    p50 = statistics.median(timings)
+    p99 = timings[int(len(timings) * 0.99) - 1]
+    added = f"  (+{p99 - baseline_p99:.3f} ms p99)" if baseline_p99 is not None else ""
+    print(f"{label:<34} p50 {p50:7.3f} ms  p99 {p99:7.3f} ms{added}")
+    return p99
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--sink-delay-ms", type=float, default=1.0)
+    parser.add_argument("--sample-rate", type=float, default=settings.ACCESS_LOG_SAMPLE_RATE)
+    args = parser.parse_args()
+    delay = args.sink_delay_ms / 1000
+    warmup = min(1000, args.requests)
+
+    app = build_app()
+    asyncio.run(drive(app, warmup))
+    baseline = summarize("no logging", asyncio.run(drive(app, args.requests)))
+
+    for label, sample_rate in (
+        ("queued, every request", 1.0),
+        (f"queued, sampled at {args.sample_rate:g}", args.sample_rate),
+    ):
+        settings.ACCESS_LOG_SAMPLE_RATE = sample_rate
+        sink = SlowSink(delay)
+        log = AccessLog(stream=sink)
+        log.start()
+        logged_app = AccessLogMiddleware(app, log)
+        asyncio.run(drive(logged_app, warmup))
+        summarize(label, asyncio.run(drive(logged_app, args.requests)), baseline)
+        log.stop()
+        print(f"{'':<34} written {log.stats['written']}, dropped {log.stats['dropped']}, "
+              f"sampled out {log.stats['sampled_out']}")
+
+    sync_requests = min(args.requests, 2000)
+    sync_app = SyncLogMiddleware(app, SlowSink(delay))
+    summarize(f"synchronous write ({sync_requests} req)", asyncio.run(drive(sync_app, sync_requests)), baseline)
+
+
+if __name__ == "__main__":
+    main()
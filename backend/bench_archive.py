@@ -0,0 +1,97 @@
+"""Benchmark get_tasks latency and hot-table size before and after archiving.
+
+Seeds a throwaway SQLite database, so it never touches DATABASE_URL:
+
+    python bench_archive.py --users 20 --tasks-per-user 5000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+os.environ.setdefault("BETTER_AUTH_SECRET", "bench")
+os.environ.setdefault("BETTER_AUTH_URL", "http://localhost:3000")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+from sqlalchemy import func, insert
+from sqlmodel import Session, SQLModel, create_engine, select
+from app.models.user import User
+from app.models.task import Task, ArchivedTask
+from app.core.archive import archive_completed_tasks
+
+
+def seed(engine, users: int, tasks_per_user: int, completed_ratio: float, rng: random.Random) -> list[str]:
+    """Insert users and tasks with completion spread over the last year."""
+    now = datetime.utcnow()
+    user_ids = [str(uuid4()) for _ in range(users)]
+    with Session(engine) as session:
+        session.execute(insert(User), [
+            {"id": uid, "email": f"bench{i}@example.com", "hashed_password": "x",
+             "created_at": now, "updated_at": now}
+            for i, uid in enumerate(user_ids)
+        ])
+        for uid in user_ids:
+            rows = []
+            for n in range(tasks_per_user):
+                completed = rng.random() < completed_ratio
+                touched = now - timedelta(days=rng.uniform(0, 365))
+                rows.append({
+                    "id": str(uuid4()), "title": f"Task {n}", "completed": completed,
+                    "completed_at": touched if completed else None,
+                    "priority": "medium", "user_id": uid,
+                    "created_at": touched, "updated_at": touched,
+                })
+            session.execute(insert(Task), rows)
+        session.commit()
+    return user_ids
+
+
+def measure(engine, user_ids: list[str], rounds: int) -> tuple[int, float, float]:
+    """Return hot-table row count plus median and p95 get_tasks latency (ms)."""
+    timings = []
+    with Session(engine) as session:
+        hot_rows = session.exec(select(func.count()).select_from(Task)).one()
+        for _ in range(rounds):
+            for uid in user_ids:
+                start = time.perf_counter()
+                session.exec(select(Task).where(Task.user_id == uid)).all()
+                timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return hot_rows, statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Archive benchmark")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--tasks-per-user", type=int, default=5000)
+    parser.add_argument("--completed-ratio", type=float, default=0.7)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/bench.db")
+        SQLModel.metadata.create_all(engine)
+        user_ids = seed(engine, args.users, args.tasks_per_user, args.completed_ratio,
+                        random.Random(args.seed))
+
+        size_before = os.path.getsize(f"{tmp}/bench.db")
+        rows, p50, p95 = measure(engine, user_ids, args.rounds)
+        print(f"before: hot rows={rows} db bytes={size_before} get_tasks p50={p50:.2f}ms p95={p95:.2f}ms")
+
+        start = time.perf_counter()
+        with Session(engine) as session:
+            moved = archive_completed_tasks(session, args.days, 1000)
+        print(f"archived {moved} tasks in {time.perf_counter() - start:.2f}s")
+
+        rows, p50, p95 = measure(engine, user_ids, args.rounds)
+        print(f"after:  hot rows={rows} get_tasks p50={p50:.2f}ms p95={p95:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
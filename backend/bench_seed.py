@@ -0,0 +1,126 @@
+"""Benchmark bulk-load strategies used by seed_db.py.
+
+Loads the same synthetic users and tasks into a fresh SQLite database three
+ways: ORM objects added one by one (users first, committed every
+--batch-size rows),
+one INSERT statement per row, and seed_db's Loader (multi-row executemany
+per batch, COPY on PostgreSQL). Foreign keys are enforced to catch rows
+loaded before their parents:
+
+    python bench_seed.py --users 2000 --tasks-per-user 50
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from uuid import UUID
+
+os.environ.setdefault("BETTER_AUTH_SECRET", "bench")
+os.environ.setdefault("BETTER_AUTH_URL", "http://localhost:3000")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+from sqlalchemy import event, insert
+from sqlmodel import Session, SQLModel, create_engine
+from app.models import Task, User
+from seed_db import Loader
+
+
+def generate(users: int, tasks_per_user: int, rng: random.Random) -> tuple[list[dict], list[dict]]:
+    anchor = datetime(2026, 1, 1)
+    user_rows, task_rows = [], []
+    for n in range(users):
+        user_id = str(UUID(int=rng.getrandbits(128), version=4))
+        joined = anchor - timedelta(days=rng.random() * 365)
+        user_rows.append({
+            "id": user_id, "email": f"user{n}@bench.example.com", "name": f"User {n}",
+            "hashed_password": "x", "created_at": joined, "updated_at": joined,
+        })
+        for _ in range(tasks_per_user):
+            task_id = str(UUID(int=rng.getrandbits(128), version=4))
+            completed = rng.random() < 0.4
+            task_rows.append({
+                "id": task_id, "title": "Bench task", "description": None, "completed": completed,
+                "completed_at": joined if completed else None, "priority": "medium", "due_date": None,
+                "user_id": user_id, "series_id": None, "occurrence_at": None,
+                "created_at": joined, "updated_at": joined, "parent_id": None, "depth": 0,
+                "path": f"{task_id}/", "subtask_count": 0, "subtask_completed_count": 0,
+            })
+    return user_rows, task_rows
+
+
+def fresh_engine(directory: str, name: str):
+    db_engine = create_engine(f"sqlite:///{directory}/{name}.db")
+
+    @event.listens_for(db_engine, "connect")
+    def enforce_foreign_keys(connection, _):
+        connection.execute("PRAGMA foreign_keys=ON")
+
+    SQLModel.metadata.create_all(db_engine)
+    return db_engine
+
+
+def load_orm(db_engine, user_rows, task_rows, batch_size: int) -> None:
+    with Session(db_engine) as session:
+        for count, row in enumerate(user_rows, 1):
+            session.add(User(**row))
+            if count % batch_size == 0:
+                session.commit()
+        session.commit()
+        for count, row in enumerate(task_rows, 1):
+            session.add(Task(**row))
+            if count % batch_size == 0:
+                session.commit()
+        session.commit()
+
+
+def load_row_inserts(db_engine, user_rows, task_rows, batch_size: int) -> None:
+    with db_engine.begin() as connection:
+        for table, rows in ((User.__table__, user_rows), (Task.__table__, task_rows)):
+            for row in rows:
+                connection.execute(insert(table).values(row))
+
+
+def load_loader(db_engine, user_rows, task_rows, batch_size: int) -> None:
+    # Interleaved like seed_db: each user followed by its tasks
+    loader = Loader(batch_size)
+    tasks_by_user: dict[str, list[dict]] = {}
+    for row in task_rows:
+        tasks_by_user.setdefault(row["user_id"], []).append(row)
+    for user in user_rows:
+        loader.add(db_engine, User.__table__, user)
+        for task in tasks_by_user.get(user["id"], ()):
+            loader.add(db_engine, Task.__table__, task)
+    loader.flush_all()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--tasks-per-user", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    user_rows, task_rows = generate(args.users, args.tasks_per_user, random.Random(1))
+    rows = len(user_rows) + len(task_rows)
+    directory = tempfile.mkdtemp()
+    print(f"Loading {len(user_rows)} users and {len(task_rows)} tasks ({rows} rows) into SQLite")
+
+    baseline = None
+    for label, load in (
+        ("ORM objects", load_orm),
+        ("one INSERT per row", load_row_inserts),
+        ("Loader (batched executemany)", load_loader),
+    ):
+        db_engine = fresh_engine(directory, label.split()[0].lower())
+        started = time.perf_counter()
+        load(db_engine, user_rows, task_rows, args.batch_size)
+        elapsed = time.perf_counter() - started
+        baseline = baseline or elapsed
+        print(f"{label:<30} {elapsed:7.2f}s  {rows / elapsed:>10,.0f} rows/s  ({baseline / elapsed:.1f}x)")
+        db_engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
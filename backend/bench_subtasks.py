@@ -0,0 +1,114 @@
+"""Benchmark subtree reads, moves, roll-ups and deletes on deep and wide trees.
+
+Seeds a throwaway SQLite database:
+
+    python bench_subtasks.py --deep 50 --wide 10000
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from uuid import uuid4
+
+os.environ.setdefault("BETTER_AUTH_SECRET", "bench")
+os.environ.setdefault("BETTER_AUTH_URL", "http://localhost:3000")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+from sqlalchemy import event, insert
+from sqlmodel import Session, SQLModel, create_engine
+from app.config import settings
+from app.models.user import User
+from app.models.task import Task
+from app.core.subtasks import completion_changed, delete_subtree, move_subtree, subtree_statement
+
+
+def _row(user_id: str, parent: dict | None, now: datetime) -> dict:
+    task_id = str(uuid4())
+    return {
+        "id": task_id, "title": "Task", "completed": False, "priority": "medium",
+        "user_id": user_id, "created_at": now, "updated_at": now,
+        "parent_id": parent["id"] if parent else None,
+        "depth": parent["depth"] + 1 if parent else 0,
+        "path": f"{parent['path'] if parent else ''}{task_id}/",
+        "subtask_count": 0, "subtask_completed_count": 0,
+    }
+
+
+def build_tree(session: Session, user_id: str, shape: str, size: int) -> tuple[str, str]:
+    """Insert a chain ("deep") or a root with `size` children ("wide")."""
+    now = datetime.utcnow()
+    root = _row(user_id, None, now)
+    rows = [root]
+    for _ in range(size):
+        parent = rows[-1] if shape == "deep" else root
+        rows.append(_row(user_id, parent, now))
+    # Roll-ups: every node counts all nodes below it
+    for row in rows:
+        row["subtask_count"] = len(rows) - 1 - row["depth"] if shape == "deep" else (size if row is root else 0)
+    session.execute(insert(Task), rows)
+    session.commit()
+    return root["id"], rows[-1]["id"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Subtask benchmark")
+    parser.add_argument("--deep", type=int, default=settings.TASK_MAX_DEPTH)
+    parser.add_argument("--wide", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    settings.TASK_MAX_DEPTH = max(settings.TASK_MAX_DEPTH, args.deep + 1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/bench.db")
+        SQLModel.metadata.create_all(engine)
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *a: statements.append(1))
+
+        with Session(engine) as session:
+            user_id = str(uuid4())
+            now = datetime.utcnow()
+            session.execute(insert(User), [{
+                "id": user_id, "email": "bench@example.com", "hashed_password": "x",
+                "created_at": now, "updated_at": now,
+            }])
+            session.commit()
+
+            for shape, size in (("deep", args.deep), ("wide", args.wide)):
+                root_id, leaf_id = build_tree(session, user_id, shape, size)
+                _, other_root = build_tree(session, user_id, "wide", 0)
+
+                def report(label, fn, rounds=args.rounds):
+                    timings = []
+                    statements.clear()
+                    for _ in range(rounds):
+                        session.expunge_all()
+                        start = time.perf_counter()
+                        fn()
+                        session.commit()
+                        timings.append((time.perf_counter() - start) * 1000)
+                    print(f"{shape} ({size:>6}) {label:<28} {statistics.median(timings):9.2f}ms  "
+                          f"queries/op={len(statements) // rounds}")
+
+                def fetch():
+                    return session.exec(subtree_statement(user_id, root_id)).all()
+
+                def toggle_leaf():
+                    leaf = session.get(Task, leaf_id)
+                    leaf.completed = not leaf.completed
+                    completion_changed(session, leaf)
+
+                def move_root(state={"under_other": False}):
+                    target = None if state["under_other"] else session.get(Task, other_root)
+                    move_subtree(session, session.get(Task, root_id), target)
+                    state["under_other"] = not state["under_other"]
+
+                report("fetch subtree (CTE)", fetch)
+                report("toggle leaf + roll-up", toggle_leaf)
+                report("move whole subtree", move_root, rounds=2)
+                report("delete whole subtree", lambda: delete_subtree(session, session.get(Task, root_id)), rounds=1)
+
+
+if __name__ == "__main__":
+    main()
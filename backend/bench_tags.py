@@ -0,0 +1,111 @@
+"""Benchmark tag filtering, tag counts and batched tag loading.
+
+Seeds a throwaway SQLite database with one user owning many tagged tasks:
+
+    python bench_tags.py --tasks 100000 --tags 1000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime
+from uuid import uuid4
+
+os.environ.setdefault("BETTER_AUTH_SECRET", "bench")
+os.environ.setdefault("BETTER_AUTH_URL", "http://localhost:3000")
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+from sqlalchemy import event, insert
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, SQLModel, create_engine, select
+from app.models.user import User
+from app.models.task import Task, TaskTag
+from app.core.tags import tasks_with_all_tags, tag_counts
+
+
+def seed(engine, tasks: int, tags: int, rng: random.Random) -> str:
+    """One user, each task with 1-3 tags drawn from a skewed distribution."""
+    now = datetime.utcnow()
+    user_id = str(uuid4())
+    names = [f"tag{n}" for n in range(tags)]
+    weights = [1 / (n + 1) for n in range(tags)]
+    with Session(engine) as session:
+        session.execute(insert(User), [{
+            "id": user_id, "email": "bench@example.com", "hashed_password": "x",
+            "created_at": now, "updated_at": now,
+        }])
+        task_rows, tag_rows = [], []
+        for n in range(tasks):
+            task_id = str(uuid4())
+            task_rows.append({
+                "id": task_id, "title": f"Task {n}", "completed": False, "priority": "medium",
+                "user_id": user_id, "created_at": now, "updated_at": now,
+            })
+            for name in set(rng.choices(names, weights, k=rng.randint(1, 3))):
+                tag_rows.append({"task_id": task_id, "tag": name, "user_id": user_id})
+        session.execute(insert(Task), task_rows)
+        session.execute(insert(TaskTag), tag_rows)
+        session.commit()
+    return user_id
+
+
+def timed(fn, rounds: int) -> tuple[float, int]:
+    """Median wall time (ms) and the result of the last call."""
+    timings, result = [], None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Tag benchmark")
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--tags", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/bench.db")
+        SQLModel.metadata.create_all(engine)
+
+        start = time.perf_counter()
+        user_id = seed(engine, args.tasks, args.tags, random.Random(args.seed))
+        print(f"seeded {args.tasks} tasks / {args.tags} tags in {time.perf_counter() - start:.1f}s")
+
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *a: statements.append(1))
+
+        def run(label, fn):
+            statements.clear()
+            ms, rows = timed(fn, args.rounds)
+            print(f"{label:<34} {ms:9.2f}ms  rows={rows:<7} queries/call={len(statements) // args.rounds}")
+
+        with Session(engine) as session:
+            def list_all():
+                session.expunge_all()
+                statement = select(Task).where(Task.user_id == user_id).options(selectinload(Task.tags))
+                tasks = session.exec(statement).all()
+                for task in tasks:
+                    task.tags  # already loaded; would be one query per task if lazy
+                return len(tasks)
+
+            def intersect(*names):
+                def query():
+                    ids = session.exec(tasks_with_all_tags(user_id, list(names))).all()
+                    return len(ids)
+                return query
+
+            run("list all tasks + tags (selectin)", list_all)
+            run("tasks tagged tag0", intersect("tag0"))
+            run("tasks tagged tag0 AND tag1", intersect("tag0", "tag1"))
+            run("tasks tagged tag0 AND tag1 AND tag2", intersect("tag0", "tag1", "tag2"))
+            run("tag counts", lambda: len(tag_counts(session, user_id)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Script to move users onto the shard their id hashes to.
+
+Run after changing SHARD_DATABASE_URLS, with the app stopped or in
+maintenance mode so nobody writes to a user while they are being moved.
+Databases dropped from the shard map can still be drained with --source.
+It also adds the user_directory entries that sharded logins need for users
+created while the app was unsharded, so it must be run when sharding is
+first enabled.
+
+    python rebalance_shards.py --dry-run
+    python rebalance_shards.py --source sqlite:///./old_shard.db
+"""
+import argparse
+from sqlmodel import Session, select
+from app.database import get_engine, shard_engines, shard_for_user, create_db_and_tables
+# Importing the models package registers every table, so user_tables() sees them all
+from app.models import User
+from app.core.sharding import check_user_tables, move_user, register_users
+
+
+parser = argparse.ArgumentParser(description="Move users onto the shard their id hashes to")
+parser.add_argument("--dry-run", action="store_true", help="only report what would move")
+parser.add_argument("--source", action="append", default=[],
+                    help="extra database URL to drain (e.g. a removed shard)")
+args = parser.parse_args()
+
+create_db_and_tables()
+
+sources = [(index, shard_engine) for index, shard_engine in enumerate(shard_engines)]
+sources += [(None, get_engine(url)) for url in args.source]
+
+for _, source in sources:
+    check_user_tables(source)
+
+registered = sum(register_users(source, args.dry_run) for _, source in sources)
+
+moved_users = 0
+for index, source in sources:
+    with Session(source) as session:
+        user_ids = session.exec(select(User.id)).all()
+
+    for user_id in user_ids:
+        target_index = shard_for_user(user_id)
+        if target_index == index:
+            continue
+        target = shard_engines[target_index]
+        if target is source:
+            continue
+
+        moved_users += 1
+        if args.dry_run:
+            print(f"would move {user_id}: {index} -> {target_index}")
+            continue
+        rows = move_user(user_id, source, target)
+        print(f"moved {user_id}: {index} -> {target_index} ({rows} rows)")
+
+verb = "Would move" if args.dry_run else "Moved"
+print(f"\n{verb} {moved_users} users across {len(shard_engines)} shards")
+verb = "Would register" if args.dry_run else "Registered"
+print(f"{verb} {registered} users missing from the directory")
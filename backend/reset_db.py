@@ -1,14 +1,14 @@
 """Script to reset database tables."""
 from sqlmodel import SQLModel
-from app.database import engine
-from app.models.user import User
-from app.models.task import Task
+from app.database import all_engines
+import app.models  # noqa: F401 - registers every table with the metadata
 
-# Drop all tables
-SQLModel.metadata.drop_all(engine)
-print("Dropped all tables")
+for engine in all_engines():
+    # Drop all tables
+    SQLModel.metadata.drop_all(engine)
+    print(f"Dropped all tables on {engine.url!r}")
 
-# Create all tables with new schema
-SQLModel.metadata.create_all(engine)
-print("Created all tables with updated schema")
+    # Create all tables with new schema
+    SQLModel.metadata.create_all(engine)
+    print(f"Created all tables with updated schema on {engine.url!r}")
 print("\nDatabase reset complete!")
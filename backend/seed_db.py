@@ -0,0 +1,220 @@
+"""Script to bulk-seed synthetic users and tasks for scale testing.
+
+Rows are generated deterministically from --seed (ids, timestamps relative to
+--anchor, text), so two runs with the same arguments produce identical data.
+All users share one precomputed password hash. PostgreSQL is loaded with
+COPY, other databases with batched multi-row INSERTs. With a shard map, users
+go to their shard and the email directory is filled on the primary.
+
+    python seed_db.py --users 100000 --tasks-per-user 100 --reset
+
+Analytics statistics are not generated; run backfill_stats.py afterwards.
+"""
+import argparse
+import csv
+import io
+import math
+import random
+import time
+from datetime import datetime, timedelta
+from uuid import UUID
+from sqlalchemy import insert
+from sqlmodel import SQLModel
+from app.database import all_engines, engine, is_sharded, shard_engines, shard_for_user
+from app.models.user import User, UserDirectory
+from app.models.task import Task
+from app.models.token import RevokedToken
+from app.models.activity import TaskActivity
+from app.models.stats import DailyTaskStats
+from app.core.security import hash_password
+
+
+VERBS = ["Review", "Write", "Fix", "Plan", "Call", "Email", "Update", "Prepare", "Clean", "Buy",
+         "Schedule", "Test", "Deploy", "Read", "Refactor", "Design", "Book", "Pay", "Submit", "Check"]
+NOUNS = ["report", "slides", "budget", "invoice", "meeting notes", "release", "groceries", "proposal",
+         "dentist appointment", "quarterly goals", "bug backlog", "onboarding doc", "newsletter",
+         "contract", "roadmap", "flight", "taxes", "blog post", "dashboard", "expense report"]
+LOREM = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut "
+    "labore et dolore magna aliqua ut enim ad minim veniam quis nostrud exercitation ullamco "
+    "laboris nisi ut aliquip ex ea commodo consequat duis aute irure dolor in reprehenderit in "
+    "voluptate velit esse cillum dolore eu fugiat nulla pariatur excepteur sint occaecat cupidatat "
+) * 8
+PRIORITIES = ["low", "medium", "medium", "high"]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Bulk-seed synthetic users and tasks")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--tasks-per-user", type=float, default=100, help="mean tasks per user")
+    parser.add_argument("--tasks-distribution", choices=["fixed", "uniform", "exponential", "lognormal"],
+                        default="lognormal", help="how task counts vary between users")
+    parser.add_argument("--completion-ratio", type=float, default=0.6)
+    parser.add_argument("--due-ratio", type=float, default=0.5, help="share of tasks with a due date")
+    parser.add_argument("--due-spread-days", type=int, default=90,
+                        help="due dates fall within +/- this many days of --anchor")
+    parser.add_argument("--history-days", type=int, default=365,
+                        help="tasks were created up to this many days before --anchor")
+    parser.add_argument("--description-ratio", type=float, default=0.4)
+    parser.add_argument("--description-length", type=int, default=120, help="mean description length")
+    parser.add_argument("--anchor", type=datetime.fromisoformat, default=datetime(2026, 1, 1),
+                        help="reference 'now' for generated timestamps")
+    parser.add_argument("--password", default="password123", help="password shared by all users")
+    parser.add_argument("--user-offset", type=int, default=0, help="start numbering emails here")
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--reset", action="store_true", help="drop and recreate all tables first")
+    return parser.parse_args()
+
+
+def task_count(rng: random.Random, args: argparse.Namespace) -> int:
+    mean = args.tasks_per_user
+    if args.tasks_distribution == "fixed":
+        return int(mean)
+    if args.tasks_distribution == "uniform":
+        return rng.randint(0, int(2 * mean))
+    if args.tasks_distribution == "exponential":
+        return int(rng.expovariate(1 / mean)) if mean > 0 else 0
+    # Lognormal with sigma 1, scaled so the mean stays `mean`
+    return int(rng.lognormvariate(math.log(mean) - 0.5, 1.0)) if mean > 0 else 0
+
+
+class Loader:
+    """Buffers rows per (engine, table) and flushes them in bulk."""
+
+    def __init__(self, batch_size: int):
+        self.batch_size = batch_size
+        self.buffers: dict = {}
+        self.loaded = 0
+
+    def add(self, db_engine, table, row: dict) -> None:
+        buffer = self.buffers.setdefault((db_engine, table), [])
+        buffer.append(row)
+        if len(buffer) >= self.batch_size:
+            # Flush the engine's other tables too, parents first, so a full
+            # child buffer never lands before the rows it references
+            self.flush_engine(db_engine)
+
+    def flush(self, db_engine, table) -> None:
+        rows = self.buffers.get((db_engine, table))
+        if not rows:
+            return
+        if db_engine.dialect.name == "postgresql" and db_engine.dialect.driver == "psycopg2":
+            self._copy(db_engine, table, rows)
+        else:
+            with db_engine.begin() as connection:
+                connection.execute(insert(table), rows)
+        self.loaded += len(rows)
+        rows.clear()
+
+    def flush_engine(self, db_engine) -> None:
+        # Parents first so foreign keys hold
+        for table in SQLModel.metadata.sorted_tables:
+            if (db_engine, table) in self.buffers:
+                self.flush(db_engine, table)
+
+    def flush_all(self) -> None:
+        for db_engine in {db_engine for db_engine, _ in self.buffers}:
+            self.flush_engine(db_engine)
+
+    @staticmethod
+    def _copy(db_engine, table, rows: list[dict]) -> None:
+        columns = list(rows[0])
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([row[column] for column in columns])
+        buffer.seek(0)
+        connection = db_engine.raw_connection()
+        try:
+            with connection.cursor() as cursor:
+                cursor.copy_expert(
+                    f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+                    buffer
+                )
+            connection.commit()
+        finally:
+            connection.close()
+
+
+def main() -> None:
+    args = parse_args()
+    rng = random.Random(args.seed)
+
+    def new_id() -> str:
+        return str(UUID(int=rng.getrandbits(128), version=4))
+
+    if args.reset:
+        for db_engine in all_engines():
+            SQLModel.metadata.drop_all(db_engine)
+    for db_engine in all_engines():
+        SQLModel.metadata.create_all(db_engine)
+
+    # One bcrypt hash for everyone instead of one per user
+    hashed_password = hash_password(args.password)
+    loader = Loader(args.batch_size)
+    users_table, tasks_table, directory_table = User.__table__, Task.__table__, UserDirectory.__table__
+    history = timedelta(days=args.history_days).total_seconds()
+    spread = timedelta(days=args.due_spread_days).total_seconds()
+    tasks_total = 0
+    started = time.perf_counter()
+
+    for n in range(args.users):
+        user_id = new_id()
+        email = f"user{args.user_offset + n}@seed.example.com"
+        joined = args.anchor - timedelta(seconds=rng.random() * history)
+        shard = shard_engines[shard_for_user(user_id)]
+        loader.add(shard, users_table, {
+            "id": user_id, "email": email, "name": f"Seed User {args.user_offset + n}",
+            "hashed_password": hashed_password, "created_at": joined, "updated_at": joined,
+        })
+        if is_sharded():
+            loader.add(engine, directory_table, {"email": email, "user_id": user_id, "created_at": joined})
+
+        for _ in range(task_count(rng, args)):
+            task_id = new_id()
+            created = joined + timedelta(seconds=rng.random() * (args.anchor - joined).total_seconds())
+            completed = rng.random() < args.completion_ratio
+            updated = created + timedelta(seconds=rng.random() * (args.anchor - created).total_seconds()) \
+                if completed else created
+            due_date = None
+            if rng.random() < args.due_ratio:
+                due_date = (args.anchor + timedelta(seconds=rng.uniform(-spread, spread))).replace(microsecond=0)
+            description = None
+            if rng.random() < args.description_ratio:
+                length = min(1000, max(1, int(rng.expovariate(1 / args.description_length))))
+                start = rng.randrange(len(LOREM) - length)
+                description = LOREM[start:start + length].strip() or "notes"
+
+            loader.add(shard, tasks_table, {
+                "id": task_id,
+                "title": f"{rng.choice(VERBS)} {rng.choice(NOUNS)}",
+                "description": description,
+                "completed": completed,
+                "completed_at": updated if completed else None,
+                "priority": rng.choice(PRIORITIES),
+                "due_date": due_date,
+                "user_id": user_id,
+                "series_id": None,
+                "occurrence_at": None,
+                "created_at": created,
+                "updated_at": updated,
+                "parent_id": None,
+                "depth": 0,
+                "path": f"{task_id}/",
+                "subtask_count": 0,
+                "subtask_completed_count": 0,
+            })
+            tasks_total += 1
+
+        if (n + 1) % 10_000 == 0:
+            print(f"  {n + 1} users, {tasks_total} tasks generated ({time.perf_counter() - started:.0f}s)")
+
+    loader.flush_all()
+    elapsed = time.perf_counter() - started
+    print(f"Seeded {args.users} users and {tasks_total} tasks ({loader.loaded} rows) "
+          f"in {elapsed:.1f}s ({loader.loaded / max(elapsed, 1e-9):,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,385 @@
+"""Soak test: drive the API for hours and fail on memory or resource growth.
+
+Runs the real app (``app.main:app``, with its startup jobs) in-process
+against a throwaway SQLite database and loops a weighted mix of auth, task,
+tag, list and analytics calls, including error paths (404, 422, bad tokens).
+It always creates a fresh temporary database and ignores DATABASE_URL and
+SHARD_DATABASE_URLS, so it can't write to a real one. Every --sample-every
+requests it records Python heap (tracemalloc), C heap in use outside SQLite
+(glibc only), RSS, open file descriptors, DB pool checkouts and thread
+count. RSS is reported but not gated by default: it mostly tracks SQLite's
+page caches and the allocator's free lists. Memory growth is the least-squares
+slope per 1000 requests over the last --window of the samples taken after
+warm-up, so caches that fill up early (SQLite page caches, allocator arenas)
+don't count as leaks on long runs. Counts (fds, checkouts, threads) compare
+the minimum of the window's two halves, so a sample that lands while a
+background job holds a connection isn't a leak. The run fails (exit 1)
+when any slope exceeds its limit, or any request returns 5xx, and prints the
+allocation sites that grew the most since the warm-up:
+
+    python soak_test.py --duration 14400 --samples-file soak.jsonl
+    python soak_test.py --requests 50000 --max-heap-kb-per-1k 8
+"""
+import _sqlite3
+import argparse
+import ctypes
+import gc
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from statistics import median
+from typing import Callable, Optional
+
+os.environ.setdefault("BETTER_AUTH_SECRET", "soak-test-secret-soak-test-secret")
+os.environ.setdefault("BETTER_AUTH_URL", "http://localhost:3000")
+# The test signs up users and deletes tasks for hours: always run it against a
+# fresh scratch database, never one from the environment or .env
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='soak-')}/soak.db"
+os.environ["SHARD_DATABASE_URLS"] = "[]"
+os.environ.setdefault("ACCESS_LOG_FILE", os.devnull)
+
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database import all_engines, pool_status
+
+
+PRIORITIES = ["low", "medium", "high"]
+TAGS = ["work", "home", "errand", "urgent", "later", "reading", "health", "finance"]
+
+
+class Worker:
+    """One simulated user with a bounded set of live tasks."""
+
+    def __init__(self, client: TestClient, index: int, rng: random.Random):
+        self.client = client
+        self.rng = rng
+        self.email = f"soak{index}@example.com"
+        self.tasks: list[str] = []
+        self.lists: list[str] = []
+        response = client.post("/api/auth/signup", json={
+            "email": self.email, "password": "soak-password", "name": f"Soak {index}"
+        })
+        self._set_tokens(response)
+
+    def _set_tokens(self, response) -> None:
+        data = response.json()["data"]
+        self.headers = {"Authorization": f"Bearer {data['token']}"}
+        self.refresh_token = data["refresh_token"]
+
+    def call(self, method: str, path: str, **kwargs):
+        return self.client.request(method, path, headers=self.headers, **kwargs)
+
+    # Operations, each one request
+    def list_tasks(self):
+        params = self.rng.choice([
+            {}, {"tag": self.rng.choice(TAGS)}, {"tag": self.rng.sample(TAGS, 2)},
+            {"list_id": self.rng.choice(self.lists)} if self.lists else {},
+        ])
+        return self.call("GET", "/api/tasks", params=params)
+
+    def get_task(self):
+        if not self.tasks:
+            return self.create_task()
+        return self.call("GET", f"/api/tasks/{self.rng.choice(self.tasks)}")
+
+    def create_task(self):
+        body = {
+            "title": f"Soak task {self.rng.randrange(10**6)}",
+            "priority": self.rng.choice(PRIORITIES),
+            "tags": self.rng.sample(TAGS, self.rng.randint(0, 3)),
+        }
+        if self.rng.random() < 0.5:
+            body["description"] = "x" * self.rng.randint(1, 500)
+        if self.tasks and self.rng.random() < 0.2:
+            body["parent_id"] = self.rng.choice(self.tasks)
+        if self.lists and self.rng.random() < 0.2:
+            body["list_id"] = self.rng.choice(self.lists)
+        response = self.call("POST", "/api/tasks", json=body)
+        if response.status_code == 201:
+            self.tasks.append(response.json()["id"])
+        return response
+
+    def update_task(self):
+        if not self.tasks:
+            return self.create_task()
+        return self.call("PUT", f"/api/tasks/{self.rng.choice(self.tasks)}", json={
+            "title": f"Updated {self.rng.randrange(10**6)}",
+            "priority": self.rng.choice(PRIORITIES),
+            "tags": self.rng.sample(TAGS, self.rng.randint(0, 3)),
+        })
+
+    def toggle_task(self):
+        if not self.tasks:
+            return self.create_task()
+        return self.call("PATCH", f"/api/tasks/{self.rng.choice(self.tasks)}/complete")
+
+    def delete_task(self):
+        if not self.tasks:
+            return self.create_task()
+        task_id = self.tasks.pop(self.rng.randrange(len(self.tasks)))
+        response = self.call("DELETE", f"/api/tasks/{task_id}")
+        # Subtasks go with their parent; forget ids that no longer resolve
+        if response.status_code == 204 and self.rng.random() < 0.1:
+            self.tasks = [t for t in self.tasks if self.call("GET", f"/api/tasks/{t}").status_code == 200]
+        return response
+
+    def tag_counts(self):
+        return self.call("GET", "/api/tasks/tags")
+
+    def analytics(self):
+        return self.call("GET", "/api/analytics/tasks", params={"bucket": self.rng.choice(["day", "week"])})
+
+    def lists_round_trip(self):
+        if len(self.lists) < 3:
+            response = self.call("POST", "/api/lists", json={"name": f"List {self.rng.randrange(1000)}"})
+            if response.status_code == 201:
+                self.lists.append(response.json()["id"])
+            return response
+        return self.call("GET", f"/api/lists/{self.rng.choice(self.lists)}")
+
+    def refresh(self):
+        response = self.client.post("/api/auth/refresh", json={"refresh_token": self.refresh_token})
+        if response.status_code == 200:
+            self._set_tokens(response)
+        return response
+
+    def login(self):
+        response = self.client.post("/api/auth/login", json={"email": self.email, "password": "soak-password"})
+        if response.status_code == 200:
+            self._set_tokens(response)
+        return response
+
+    def not_found(self):
+        return self.call("GET", "/api/tasks/00000000-0000-0000-0000-000000000000")
+
+    def invalid_body(self):
+        return self.call("POST", "/api/tasks", json={"title": ""})
+
+    def bad_token(self):
+        return self.client.get("/api/tasks", headers={"Authorization": "Bearer not-a-token"})
+
+
+# Operation weights, roughly a busy frontend's read/write mix
+MIX = {
+    "list_tasks": 25, "get_task": 15, "create_task": 12, "update_task": 10, "toggle_task": 10,
+    "delete_task": 8, "tag_counts": 5, "analytics": 3, "lists_round_trip": 3, "refresh": 2,
+    "login": 0.2, "not_found": 3, "invalid_body": 2, "bad_token": 2,
+}
+
+
+def rss_kb() -> float:
+    """Resident set size; peak RSS where /proc isn't available."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class _MallInfo2(ctypes.Structure):
+    _fields_ = [(name, ctypes.c_size_t) for name in (
+        "arena", "ordblks", "smblks", "hblks", "hblkhd", "usmblks", "fsmblks", "uordblks", "fordblks", "keepcost"
+    )]
+
+
+def native_heap_probe() -> Optional[Callable[[], float]]:
+    """KB of C heap in use outside SQLite, where glibc's mallinfo2 is available.
+
+    Unlike RSS this leaves out the allocator's free lists and SQLite's page
+    caches, which grow with the database, and tracemalloc's own trace table,
+    which doubles in 1 MB steps. A clean run grows only a few tens of KB per
+    1000 requests, so a native leak stands out.
+    """
+    try:
+        libc = ctypes.CDLL("libc.so.6")
+        libc.mallinfo2.restype = _MallInfo2
+        libsqlite = ctypes.CDLL(_sqlite3.__file__)
+        libsqlite.sqlite3_memory_used.restype = ctypes.c_int64
+    except (OSError, AttributeError):
+        return None
+
+    def native_kb() -> float:
+        info = libc.mallinfo2()
+        used = info.uordblks + info.hblkhd - libsqlite.sqlite3_memory_used()
+        return (used - tracemalloc.get_tracemalloc_memory()) / 1024
+    return native_kb
+
+
+def open_fds() -> int:
+    for path in ("/proc/self/fd", "/dev/fd"):
+        try:
+            return len(os.listdir(path))
+        except OSError:
+            continue
+    return 0
+
+
+native_kb = native_heap_probe()
+
+
+def sample(requests: int) -> dict:
+    gc.collect()
+    pools = [pool_status(db_engine) for db_engine in all_engines()]
+    return {
+        "requests": requests,
+        "time": time.time(),
+        "heap_kb": tracemalloc.get_traced_memory()[0] / 1024,
+        "rss_kb": rss_kb(),
+        "native_kb": native_kb() if native_kb else None,
+        "fds": open_fds(),
+        "checked_out": sum(pool.get("checked_out", 0) for pool in pools),
+        "threads": threading.active_count(),
+    }
+
+
+def slope_per_1k(samples: list[dict], key: str) -> float:
+    """Least-squares growth of a metric per 1000 requests."""
+    xs = [s["requests"] for s in samples]
+    ys = [s[key] for s in samples]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    if not variance:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / variance * 1000
+
+
+def floor_growth_per_1k(samples: list[dict], key: str) -> float:
+    """Change in the minimum of a count between the window's two halves, per 1000 requests.
+
+    Counts like open fds or pool checkouts jump when a sample happens to land
+    while a background job (e.g. the activity writer) holds a connection; a
+    leak raises every later sample, so it moves the floor, a spike doesn't.
+    """
+    half = len(samples) // 2
+    first, last = samples[:half], samples[-half:]
+    span = median(s["requests"] for s in last) - median(s["requests"] for s in first)
+    if not span:
+        return 0.0
+    return (min(s[key] for s in last) - min(s[key] for s in first)) / span * 1000
+
+
+def top_growth(baseline: tracemalloc.Snapshot, limit: int) -> list[tracemalloc.StatisticDiff]:
+    """Allocation sites that grew the most since the baseline snapshot."""
+    ignore = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    ]
+    current = tracemalloc.take_snapshot().filter_traces(ignore)
+    diffs = current.compare_to(baseline.filter_traces(ignore), "lineno")
+    return [diff for diff in diffs if diff.size_diff > 0][:limit]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=3600, help="seconds to run")
+    parser.add_argument("--requests", type=int, help="stop after this many requests instead")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--max-tasks-per-user", type=int, default=200)
+    parser.add_argument("--warmup-requests", type=int, default=5000)
+    parser.add_argument("--sample-every", type=int, default=1000)
+    parser.add_argument("--window", type=float, default=0.5,
+                        help="fraction of post-warm-up samples (the latest) used for growth")
+    parser.add_argument("--trace-frames", type=int, default=1, help="tracemalloc frames per allocation")
+    parser.add_argument("--top", type=int, default=15, help="allocation sites to report")
+    parser.add_argument("--samples-file", help="append each sample here as a JSON line")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--max-heap-kb-per-1k", type=float, default=32.0)
+    # Clean runs grow native_kb by ~30 KB/1k; RSS drifts by 250-600 KB/1k with
+    # SQLite's page caches and the allocator's free lists, so it is only
+    # reported unless a limit is given
+    parser.add_argument("--max-native-kb-per-1k", type=float, default=96.0)
+    parser.add_argument("--max-rss-kb-per-1k", type=float)
+    parser.add_argument("--max-fds-per-1k", type=float, default=0.1)
+    parser.add_argument("--max-checkouts-per-1k", type=float, default=0.1)
+    parser.add_argument("--max-threads-per-1k", type=float, default=0.1)
+    args = parser.parse_args()
+    # metric -> (growth measure, limit)
+    limits = {
+        "heap_kb": (slope_per_1k, args.max_heap_kb_per_1k),
+        "native_kb": (slope_per_1k, args.max_native_kb_per_1k),
+        "rss_kb": (slope_per_1k, args.max_rss_kb_per_1k),
+        "fds": (floor_growth_per_1k, args.max_fds_per_1k),
+        "checked_out": (floor_growth_per_1k, args.max_checkouts_per_1k),
+        "threads": (floor_growth_per_1k, args.max_threads_per_1k),
+    }
+
+    rng = random.Random(args.seed)
+    operations, weights = zip(*MIX.items())
+    tracemalloc.start(args.trace_frames)
+    samples: list[dict] = []
+    samples_file = open(args.samples_file, "a") if args.samples_file else None
+    baseline = None
+    requests, failures = 0, 0
+    deadline = time.monotonic() + args.duration
+
+    with TestClient(app) as client:
+        workers = [Worker(client, index, rng) for index in range(args.users)]
+        while time.monotonic() < deadline and (args.requests is None or requests < args.requests):
+            worker = rng.choice(workers)
+            operation = rng.choices(operations, weights)[0]
+            if operation == "create_task" and len(worker.tasks) >= args.max_tasks_per_user:
+                operation = "delete_task"
+            response = getattr(worker, operation)()
+            requests += 1
+            if response.status_code >= 500:
+                failures += 1
+
+            if requests == args.warmup_requests:
+                gc.collect()
+                baseline = tracemalloc.take_snapshot()
+            if requests % args.sample_every == 0:
+                point = sample(requests)
+                if baseline is not None:
+                    samples.append(point)
+                if samples_file:
+                    samples_file.write(json.dumps(point) + "\n")
+                    samples_file.flush()
+                print(f"{requests:>9} req  heap {point['heap_kb']:>9.0f} KB  native {point['native_kb'] or 0:>9.0f} KB  rss {point['rss_kb']:>9.0f} KB  "
+                      f"fds {point['fds']:>4}  pool out {point['checked_out']:>2}  "
+                      f"threads {point['threads']:>3}  5xx {failures}", flush=True)
+
+    if samples_file:
+        samples_file.close()
+    samples = samples[-max(3, round(len(samples) * args.window)):]
+    if len(samples) < 3:
+        print("Not enough samples after warm-up to measure growth; run longer", file=sys.stderr)
+        return 2
+
+    print(f"\nGrowth per 1000 requests over {samples[-1]['requests'] - samples[0]['requests']} requests:")
+    failed = []
+    for key, (measure, limit) in limits.items():
+        if any(s[key] is None for s in samples):
+            print(f"  {key:<12} {'n/a':>10}  (not measurable on this platform)")
+            continue
+        growth = measure(samples, key)
+        if limit is None:
+            print(f"  {key:<12} {growth:>10.3f}  (not gated)")
+            continue
+        verdict = "FAIL" if growth > limit else "ok"
+        if growth > limit:
+            failed.append(key)
+        print(f"  {key:<12} {growth:>10.3f}  (limit {limit:g})  {verdict}")
+    if failures:
+        print(f"  {failures} requests returned 5xx")
+
+    print(f"\nTop {args.top} growing allocation sites since warm-up:")
+    for diff in top_growth(baseline, args.top):
+        frame = diff.traceback[0]
+        print(f"  {diff.size_diff / 1024:>9.1f} KB  {diff.count_diff:>+8} blocks  {frame.filename}:{frame.lineno}")
+
+    if failed or failures:
+        print(f"\nFAILED: {', '.join(failed) or '5xx responses'}")
+        return 1
+    print("\nPASSED")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,5 @@
 import { Task, CreateTaskDto, UpdateTaskDto } from "@/types/task";
+import { auth } from "@/lib/auth";
 
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
 
@@ -44,7 +45,8 @@ class ApiClient {
 
   private async request<T>(
     endpoint: string,
-    options?: RequestInit
+    options?: RequestInit,
+    retried = false
   ): Promise<T> {
     const token = this.getAuthToken();
 
@@ -70,11 +72,19 @@ class ApiClient {
         headers,
       });
 
-      // Handle 401 Unauthorized - redirect to login
+      // Handle 401 Unauthorized - refresh once, otherwise redirect to login.
+      // If another request already refreshed meanwhile, just retry with its token.
       if (response.status === 401) {
+        if (
+          !retried &&
+          (this.getAuthToken() !== token || (await auth.refresh()))
+        ) {
+          return this.request<T>(endpoint, options, true);
+        }
         if (typeof window !== "undefined") {
           localStorage.removeItem("auth_token");
           localStorage.removeItem("auth_user");
+          localStorage.removeItem("auth_refresh_token");
           window.location.href = "/login";
         }
         throw new ApiError(401, "UNAUTHORIZED", "Authentication required");
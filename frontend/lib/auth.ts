@@ -18,6 +18,7 @@ interface BackendAuthResponse {
       email: string;
     };
     token: string;
+    refresh_token?: string;
   };
   error?: {
     code: string;
@@ -30,6 +31,8 @@ const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
 class AuthClient {
   private readonly STORAGE_KEY = "auth_token";
   private readonly USER_KEY = "auth_user";
+  private readonly REFRESH_KEY = "auth_refresh_token";
+  private refreshing: Promise<string | null> | null = null;
 
   async login(email: string, password: string): Promise<AuthResponse> {
     try {
@@ -49,12 +52,15 @@ class AuthClient {
         );
       }
 
-      const { user, token } = data.data;
+      const { user, token, refresh_token } = data.data;
 
-      // Store token and user in localStorage
+      // Store tokens and user in localStorage
       if (typeof window !== "undefined") {
         localStorage.setItem(this.STORAGE_KEY, token);
         localStorage.setItem(this.USER_KEY, JSON.stringify(user));
+        if (refresh_token) {
+          localStorage.setItem(this.REFRESH_KEY, refresh_token);
+        }
       }
 
       return { user, token };
@@ -88,12 +94,15 @@ class AuthClient {
         );
       }
 
-      const { user, token } = data.data;
+      const { user, token, refresh_token } = data.data;
 
-      // Store token and user in localStorage
+      // Store tokens and user in localStorage
       if (typeof window !== "undefined") {
         localStorage.setItem(this.STORAGE_KEY, token);
         localStorage.setItem(this.USER_KEY, JSON.stringify(user));
+        if (refresh_token) {
+          localStorage.setItem(this.REFRESH_KEY, refresh_token);
+        }
       }
 
       return { user, token };
@@ -108,15 +117,17 @@ class AuthClient {
   async logout(): Promise<void> {
     try {
       const token = this.getToken();
+      const refreshToken = this.getRefreshToken();
 
       if (token) {
-        // Call backend logout endpoint if it exists
+        // Revoke the access and refresh tokens on the server
         await fetch(`${API_BASE_URL}/api/auth/logout`, {
           method: "POST",
           headers: {
             "Content-Type": "application/json",
             Authorization: `Bearer ${token}`,
           },
+          body: JSON.stringify({ refresh_token: refreshToken }),
         });
       }
     } catch (error) {
@@ -127,10 +138,50 @@ class AuthClient {
       if (typeof window !== "undefined") {
         localStorage.removeItem(this.STORAGE_KEY);
         localStorage.removeItem(this.USER_KEY);
+        localStorage.removeItem(this.REFRESH_KEY);
       }
     }
   }
 
+  // Exchange the stored refresh token for a new token pair. Concurrent
+  // callers share one request, since the refresh token is single-use.
+  refresh(): Promise<string | null> {
+    if (!this.refreshing) {
+      this.refreshing = this.exchangeRefreshToken().finally(() => {
+        this.refreshing = null;
+      });
+    }
+    return this.refreshing;
+  }
+
+  private async exchangeRefreshToken(): Promise<string | null> {
+    const refreshToken = this.getRefreshToken();
+    if (!refreshToken) return null;
+
+    try {
+      const response = await fetch(`${API_BASE_URL}/api/auth/refresh`, {
+        method: "POST",
+        headers: {
+          "Content-Type": "application/json",
+        },
+        body: JSON.stringify({ refresh_token: refreshToken }),
+      });
+
+      const data: BackendAuthResponse = await response.json();
+      if (!response.ok || !data.success || !data.data) {
+        return null;
+      }
+
+      localStorage.setItem(this.STORAGE_KEY, data.data.token);
+      if (data.data.refresh_token) {
+        localStorage.setItem(this.REFRESH_KEY, data.data.refresh_token);
+      }
+      return data.data.token;
+    } catch {
+      return null;
+    }
+  }
+
   getCurrentUser(): User | null {
     if (typeof window === "undefined") return null;
 
@@ -149,6 +200,11 @@ class AuthClient {
     return localStorage.getItem(this.STORAGE_KEY);
   }
 
+  getRefreshToken(): string | null {
+    if (typeof window === "undefined") return null;
+    return localStorage.getItem(this.REFRESH_KEY);
+  }
+
   isAuthenticated(): boolean {
     return !!this.getToken();
   }